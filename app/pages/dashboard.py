@@ -1,27 +1,60 @@
 import streamlit as st
-from utils.data_loader import load_data
-from utils import load_data
+from utils.data_loader import load_cube, load_screening, warm_model
 from utils.visualization import (plot_import_trends, 
                                 show_geo_distribution,
                                 display_kpi_cards)
 
 def render():
     st.title("Welcome: UG Real-Time Import Dashboard")
+    # Load the predictor in the background while the user reads the dashboard
+    warm_model()
     
-    # Load data
-    df = load_data()
+    # Aggregates only; identical in the in-memory and streaming modes
+    cube = load_cube()
     
     # KPI Cards
     st.subheader("Key Performance Indicators")
-    display_kpi_cards(df)
+    display_kpi_cards(cube)
     
     # Main columns
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader("Import Value Trends")
-        plot_import_trends(df)
+        plot_import_trends(cube)
         
     with col2:
         st.subheader("Top Import Partners")
-        show_geo_distribution(df)
\ No newline at end of file
+        show_geo_distribution(cube)
+
+    render_screening()
+
+    # Pre-render the reports' default charts while this page is being read
+    from app.pages.reports import start_warming
+    start_warming()
+
+def render_screening():
+    # Written by the offline `python -m utils.screening` job; nothing is scored here
+    screening = load_screening()
+    if screening is None:
+        return
+    summary, flagged = screening
+
+    st.subheader("Possibly Under-declared Imports")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Declarations Screened", f"{summary['rows']:,}")
+    col2.metric("Flagged", f"{summary['flagged']:,}",
+                f"{summary['flagged'] / max(summary['rows'], 1):.2%} of screened", delta_color="off")
+    col3.metric("Flag Threshold", f"z ≤ -{summary['z_threshold']:g}")
+    st.caption(f"Declared unit price compared with the model's price within each HS code and "
+               f"country of origin. Last run {summary['completed_at']}.")
+
+    columns = ['HS_Code', 'Item_Description', 'Country_of_Origin', 'Year', 'Month',
+               'Unit_Price_UGX', 'Predicted_Unit_Price_UGX', 'Z_Score']
+    st.dataframe(
+        flagged[columns].head(50).style.format({
+            'Unit_Price_UGX': "{:,.0f}",
+            'Predicted_Unit_Price_UGX': "{:,.0f}",
+            'Z_Score': "{:.1f}"
+        })
+    )
@@ -0,0 +1,66 @@
+import pandas as pd
+import streamlit as st
+from utils import telemetry
+from utils.data_loader import load_figure_cache, load_prediction_cache
+
+# Hidden page: listed in the navigation only with UG_PERFORMANCE_PAGE=1
+
+def span_summary(spans):
+    frame = pd.DataFrame(spans)
+    grouped = frame.groupby('span')['ms']
+    return pd.DataFrame({
+        'calls': grouped.size(),
+        'mean_ms': grouped.mean(),
+        'p50_ms': grouped.median(),
+        'p95_ms': grouped.quantile(0.95),
+        'max_ms': grouped.max(),
+        'total_ms': grouped.sum(),
+    }).sort_values('total_ms', ascending=False)
+
+def cached_object_sizes():
+    # Streamlit's own accounting of st.cache_data / st.cache_resource entries
+    from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
+    stats = get_data_cache_stats_provider().get_stats() + get_resource_cache_stats_provider().get_stats()
+    frame = pd.DataFrame(
+        [(stat.category_name, stat.cache_name, stat.byte_length) for stat in stats],
+        columns=['cache', 'function', 'bytes']
+    )
+    sizes = frame.groupby(['cache', 'function'])['bytes'].agg(['size', 'sum']).reset_index()
+    sizes.columns = ['cache', 'function', 'entries', 'bytes']
+    sizes['MB'] = sizes['bytes'] / 2**20
+    return sizes.drop(columns='bytes').sort_values('MB', ascending=False)
+
+def render():
+    st.title("⏱️ Performance")
+
+    st.subheader("Span Timings")
+    if not telemetry.enabled():
+        st.info("Timing spans are off. Start the app with UG_METRICS=1 to record them.")
+    else:
+        spans = telemetry.RECORDER.spans()
+        if not spans:
+            st.write("No spans recorded yet; open a few pages first.")
+        else:
+            st.caption(f"Last {len(spans)} spans in this process")
+            st.dataframe(span_summary(spans).style.format("{:,.1f}"))
+
+            with st.expander("Recent spans"):
+                recent = pd.DataFrame(spans[::-1])
+                recent['started_at'] = pd.to_datetime(recent['started_at'], unit='s')
+                recent['labels'] = recent['labels'].map(
+                    lambda labels: ', '.join(f'{key}={value}' for key, value in labels.items()))
+                st.dataframe(recent[['started_at', 'span', 'labels', 'ms', 'parent', 'thread', 'error']])
+        if st.button("Clear spans"):
+            telemetry.RECORDER.clear()
+
+    st.subheader("Cache Hit Rates")
+    caches = pd.DataFrame([
+        {'cache': 'figures', **load_figure_cache().stats()},
+        {'cache': 'predictions', **load_prediction_cache().stats()},
+    ]).set_index('cache')
+    st.dataframe(caches[['hits', 'misses', 'hit_rate', 'disk_hits']].style.format({'hit_rate': "{:.0%}"}))
+
+    st.subheader("Memory per Cached Object")
+    # Sizing walks every cached object, so it only runs on request
+    if st.button("Measure cached objects"):
+        st.dataframe(cached_object_sizes().style.format({'MB': "{:,.1f}"}))
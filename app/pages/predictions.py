@@ -1,11 +1,49 @@
 import streamlit as st
-import pandas as pd
-from utils.data_loader import load_model, load_data
+import tempfile
+from utils.data_loader import load_model, load_data, load_prediction_cache, model_version
+from utils.batch_predict import DEFAULT_CHUNKSIZE, score_stream
+from utils.config import INTERVAL_COVERAGE
+from utils.features import build_features
+from utils.prediction_cache import cached_predict, cached_predict_interval
+from utils.telemetry import span
+
+def render_batch(model, preprocessor):
+    st.write("Upload a CSV of declarations with the same fields as the form. "
+             "Rows are scored in chunks and written to a downloadable file.")
+    uploaded = st.file_uploader("Declarations CSV", type="csv")
+    chunksize = st.number_input("Rows per chunk", min_value=1000, value=DEFAULT_CHUNKSIZE, step=1000)
+    if uploaded is None or not st.button("Score File"):
+        return
+
+    progress = st.progress(0.0, text="Scoring...")
+
+    def report(rows, bytes_read):
+        share = min(bytes_read / uploaded.size, 1.0) if bytes_read and uploaded.size else 0.0
+        progress.progress(share, text=f"{rows:,} rows scored")
+
+    try:
+        with tempfile.TemporaryFile(mode='w+', newline='') as sink:
+            rows = score_stream(uploaded, sink, model, preprocessor, int(chunksize), report)
+            sink.seek(0)
+            progress.progress(1.0, text=f"{rows:,} rows scored")
+            st.download_button(
+                "Download Predictions",
+                data=sink.read(),
+                file_name=f"scored_{uploaded.name}",
+                mime="text/csv"
+            )
+    except Exception as e:
+        st.error(f"Batch scoring failed: {str(e)}")
 
 def render():
     st.title("🔮 Unit Price Predictor")
     model, preprocessor = load_model()
     
+    mode = st.radio("Prediction Mode", ["Single Declaration", "Batch File"], horizontal=True)
+    if mode == "Batch File":
+        render_batch(model, preprocessor)
+        return
+
     # Get dynamic options from actual data
     df = load_data()
     countries = df['Country_of_Origin'].unique().tolist()
@@ -37,18 +75,8 @@ def render():
         
     if submitted:
         try:
-            # Calculate derived features
-            year = year_month // 100
-            month = year_month % 100
-            import_duration = year + month/12
-            fob_per_kg = fob_value / (gross_mass + 1e-6)
-            freight_per_kg = freight / (gross_mass + 1e-6)
-            insurance_per_kg = insurance / (gross_mass + 1e-6)
-            value_density = (fob_value + freight + insurance) / (gross_mass + 1e-6)
-            tax_load = (fob_value + freight + insurance) * tax_rate
-
-            # Create input dataframe
-            input_data = pd.DataFrame([{
+            # Raw fields; derived features and defaults come from utils.features
+            declaration = {
                 'HS_Code': hs_code,
                 'Item_Description': item_desc,
                 'Country_of_Origin': country,
@@ -60,32 +88,37 @@ def render():
                 'FOB_Value_USD': fob_value,
                 'Freight_USD': freight,
                 'Insurance_USD': insurance,
-                'CIF_Value_USD': fob_value + freight + insurance,
                 'Tax_Rate': tax_rate,
-                'Mode_of_Transport': 'AIR',  # Default value
-                'Currency_Code': 'USD',      # Default value
-                'Valuation_Method': 'CIF',   # Default value
-                'Year': year,
-                'Month': month,
-                'FOB_per_kg': fob_per_kg,
-                'Freight_per_kg': freight_per_kg,
-                'Insurance_per_kg': insurance_per_kg,
-                'Value_Density': value_density,
-                'Tax_Load': tax_load,
-                'Import_Duration': import_duration
-            }])
+                'Year': year_month // 100,
+                'Month': year_month % 100
+            }
 
-            # Ensure correct column order
-            input_data = input_data[preprocessor.feature_names_in_]
-            
-            # Transform and predict
-            processed = preprocessor.transform(input_data)
-            prediction = model.predict(processed)[0]
+            with span('predict.request', mode='form'):
+                # Built directly in preprocessor.feature_names_in_ order
+                with span('predict.features', mode='form'):
+                    input_data = build_features(declaration, preprocessor.feature_names_in_)
+                
+                # Transform and predict, reusing earlier results for identical inputs
+                cache = load_prediction_cache()
+                version = model_version(model) or 'unversioned'
+                if INTERVAL_COVERAGE:
+                    # Point and range from one pass over the trees
+                    point, lower, upper = cached_predict_interval(cache, version, model, preprocessor,
+                                                                  input_data, INTERVAL_COVERAGE)
+                    prediction = point[0]
+                else:
+                    prediction = cached_predict(cache, version, model, preprocessor, input_data)[0]
             
             st.success(f"Predicted Unit Price: UGX {prediction:,.0f}")
+            if INTERVAL_COVERAGE:
+                st.write(f"{INTERVAL_COVERAGE:.0%} of the forest's trees predict between "
+                         f"UGX {lower[0]:,.0f} and UGX {upper[0]:,.0f}")
+            stats = cache.stats()
+            st.caption(f"Prediction cache: {stats['hits']} hits, {stats['misses']} misses "
+                       f"({stats['hit_rate']:.0%} hit rate)")
             
         except Exception as e:
             st.error(f"Prediction failed: {str(e)}")
             st.write("### Debug Information:")
             st.write("Required columns:", preprocessor.feature_names_in_)
-            st.write("Provided columns:", input_data.columns.tolist())
\ No newline at end of file
+            st.write("Provided fields:", list(declaration))
\ No newline at end of file
@@ -1,239 +1,416 @@
 import streamlit as st
 import plotly.express as px
-import plotly.graph_objects as go
-from utils.data_loader import load_data
+from utils.data_loader import dataset_version, load_cube, load_figure_cache, load_indexed_data
+from utils import cube as olap
+from utils.schema import with_plain_strings
+from utils.downsample import downsample_scatter, histogram_bins, render_mode
+from utils.figure_cache import cached_chart, figure_key, warm_in_background
+from utils.telemetry import span
+from utils.trends import grouped_trends
+from utils.visualization import dashboard_views
 from datetime import datetime
 import pandas as pd  # Needed for Categorical ordering
 
+REPORT_TYPES = [
+    "Top Import Items",
+    "Country Analysis",
+    "Price & Value Trends",
+    "Transport Mode Analysis",
+    "Tax Burden Analysis",
+    "Monthly/Yearly Trends"
+]
+
+PRICE_DENSITY_COLUMNS = ['Country_of_Origin', 'Value_Density', 'Unit_Price_UGX']
+
+# ---- FIGURE BUILDERS ----
+# Pure pandas/Plotly, no Streamlit calls, so the background warmer can run them
+
+def top_items(cube):
+    items = olap.total(olap.rollup(cube, 'Item_Description'), 'CIF_Value_USD').nlargest(10)
+    items.name = 'CIF_Value_USD'
+    return items
+
+def top_items_figure(cube):
+    items = top_items(cube)
+    fig = px.bar(
+        items,
+        orientation='h',
+        color=items.values,
+        labels={'value': 'Total Value (USD)', 'index': 'Item'},
+        color_continuous_scale='Bluered'
+    )
+    fig.update_layout(
+        xaxis_title="Total Import Value (USD)",
+        yaxis_title="Product Description"
+    )
+    return fig
+
+def country_figure(country_cube, selected_country):
+    items = olap.rollup(country_cube, 'Item_Description')
+    country_data = pd.DataFrame({
+        'Item_Description': items.index.astype(object),
+        'CIF_Value_USD': olap.total(items, 'CIF_Value_USD').to_numpy(),
+        'Value_Density': olap.weighted_mean(items, 'Value_Density').to_numpy(),
+    })
+    return px.treemap(
+        country_data,
+        path=['Item_Description'],
+        values='CIF_Value_USD',
+        color='Value_Density',
+        color_continuous_scale='RdBu',
+        title=f"Import Composition from {selected_country}"
+    )
+
+def value_trend_figure(cube):
+    monthly = olap.rollup(cube, ['Year', 'Month']).reset_index()
+    trend_data = pd.DataFrame({
+        'Period': monthly['Year'].astype(str) + '-' + monthly['Month'].astype(str).str.zfill(2),
+        'CIF_Value_USD': olap.total(monthly, 'CIF_Value_USD'),
+    })
+    fig = px.line(
+        trend_data,
+        x='Period', y='CIF_Value_USD',
+        title="Monthly Import Value Trends",
+        markers=True
+    )
+    fig.update_xaxes(title="Month-Year", tickangle=45)
+    fig.update_yaxes(title="Total Import Value (USD)")
+    return fig
+
+def price_density_figure(rows, curves, show_bands):
+    import plotly.graph_objects as go
+    # Density-stratified sample keeps the shape of every country's cloud
+    scatter_data = downsample_scatter(rows, 'Value_Density', 'Unit_Price_UGX', by='Country_of_Origin')
+    palette = px.colors.qualitative.Plotly
+    countries = sorted(set(scatter_data['Country_of_Origin'].astype(str)) | set(curves['Country_of_Origin'].astype(str)))
+    color_map = {country: palette[i % len(palette)] for i, country in enumerate(countries)}
+
+    fig = px.scatter(
+        scatter_data,
+        x='Value_Density', y='Unit_Price_UGX',
+        color=scatter_data['Country_of_Origin'].astype(str),
+        color_discrete_map=color_map,
+        render_mode=render_mode(len(scatter_data)),
+        title="Value Density vs Unit Price",
+        labels={'Value_Density': 'Value per kg (USD/kg)', 'color': 'Country_of_Origin'}
+    )
+    for country, curve in curves.groupby(curves['Country_of_Origin'].astype(str)):
+        color = color_map[country]
+        if show_bands:
+            fig.add_trace(go.Scatter(
+                x=pd.concat([curve['x'], curve['x'][::-1]]),
+                y=pd.concat([curve['upper'], curve['lower'][::-1]]),
+                fill='toself', fillcolor=color, opacity=0.15,
+                line=dict(width=0), hoverinfo='skip',
+                legendgroup=country, showlegend=False
+            ))
+        fig.add_trace(go.Scatter(
+            x=curve['x'], y=curve['y'],
+            mode='lines', line=dict(color=color, width=2),
+            name=f"{country} trend", legendgroup=country, showlegend=False
+        ))
+    return fig
+
+def transport_figure(cube):
+    routes = olap.rollup(cube, ['Mode_of_Transport', 'Country_of_Origin'])
+    route_data = pd.DataFrame({
+        'CIF_Value_USD': olap.total(routes, 'CIF_Value_USD'),
+        'Freight_USD': olap.weighted_mean(routes, 'Freight_USD')
+    }).reset_index()
+    return px.sunburst(
+        with_plain_strings(route_data, ['Mode_of_Transport', 'Country_of_Origin']),
+        path=['Mode_of_Transport', 'Country_of_Origin'],
+        values='CIF_Value_USD',
+        color='Freight_USD',
+        color_continuous_scale='Viridis'
+    )
+
+def tax_distribution_figure(tax_load, total_rows=None):
+    # Binned server-side so only 50 bars reach the browser
+    bins = histogram_bins(tax_load, nbins=50)
+    title = "Distribution of Tax Burden"
+    if total_rows is not None and len(tax_load) and total_rows != len(tax_load):
+        # Streaming mode bins a uniform sample; scale it to the declarations it stands for
+        bins['count'] = (bins['count'] * total_rows / len(tax_load)).round()
+        title += " (estimated from a sample)"
+    fig = px.bar(
+        bins,
+        x='bin', y='count',
+        title=title,
+        labels={'bin': 'Tax Amount (USD)'}
+    )
+    fig.update_layout(bargap=0)
+    return fig
+
+def tax_impact_figure(cube):
+    countries = olap.rollup(cube, 'Country_of_Origin')
+    tax_impact = pd.DataFrame({
+        'Tax_Load': olap.total(countries, 'Tax_Load'),
+        'CIF_Value_USD': olap.total(countries, 'CIF_Value_USD')
+    }).reset_index()
+
+    tax_impact['Tax_Percentage'] = (tax_impact['Tax_Load'] / tax_impact['CIF_Value_USD']) * 100
+
+    return px.bar(
+        tax_impact.sort_values('Tax_Percentage', ascending=False),
+        x='Country_of_Origin', y='Tax_Percentage',
+        title="Tax as Percentage of Import Value by Country"
+    )
+
+def seasonal_figure(cube):
+    monthly = olap.rollup(cube, ['Year', 'Month'])
+    monthly_data = pd.DataFrame({
+        'CIF_Value_USD': olap.total(monthly, 'CIF_Value_USD')
+    }).reset_index()
+    monthly_data['Month_Name'] = monthly_data['Month'].apply(lambda x: datetime(2000, x, 1).strftime('%B'))
+
+    # Correct month order
+    month_order = [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December"
+    ]
+    monthly_data['Month_Name'] = pd.Categorical(monthly_data['Month_Name'], categories=month_order, ordered=True)
+
+    return px.line(
+        monthly_data,
+        x='Month_Name', y='CIF_Value_USD',
+        color='Year',
+        markers=True,
+        title="Seasonal Import Patterns"
+    )
+
+def yearly_figure(cube):
+    import plotly.graph_objects as go
+    yearly = olap.rollup(cube, 'Year')
+    yearly_data = pd.DataFrame({
+        'CIF_Value_USD': olap.total(yearly, 'CIF_Value_USD'),
+        'Unit_Price_UGX': olap.mean(yearly, 'Unit_Price_UGX'),
+        'Tax_Load': olap.total(yearly, 'Tax_Load')
+    }).reset_index()
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=yearly_data['Year'],
+        y=yearly_data['CIF_Value_USD'],
+        name='Total Value'
+    ))
+    fig.add_trace(go.Scatter(
+        x=yearly_data['Year'],
+        y=yearly_data['Unit_Price_UGX'],
+        name='Average Price',
+        yaxis='y2'
+    ))
+
+    fig.update_layout(
+        title="Yearly Import Trends",
+        yaxis=dict(title="Total Import Value (USD)"),
+        yaxis2=dict(
+            title="Average Unit Price (UGX)",
+            overlaying='y',
+            side='right'
+        )
+    )
+    return fig
+
+def figure_views(cube, df, index, selected_years, version, country=None, trend_stat='median', show_bands=False):
+    """{(report type, view): (cache key, builder)} for every report figure at these filters."""
+    cube = olap.slice_years(cube, *selected_years)
+    selection = index.select(selected_years)
+    if country is None and len(cube):
+        country = cube['Country_of_Origin'].unique()[0]
+
+    def entry(report_type, view, build, *params):
+        key = figure_key('reports', f'{report_type}/{view}', [list(selected_years), *params], version)
+        return (report_type, view), (key, build)
+
+    def price_density():
+        rows = selection.frame(df, PRICE_DENSITY_COLUMNS)
+        curves = grouped_trends(rows, 'Value_Density', 'Unit_Price_UGX', 'Country_of_Origin', stat=trend_stat)
+        return price_density_figure(rows, curves, show_bands)
+
+    return dict([
+        entry("Top Import Items", 'bar', lambda: top_items_figure(cube)),
+        entry("Country Analysis", 'treemap',
+              lambda: country_figure(cube[cube['Country_of_Origin'] == country], country), str(country)),
+        entry("Price & Value Trends", 'value', lambda: value_trend_figure(cube)),
+        entry("Price & Value Trends", 'density', price_density, trend_stat, show_bands),
+        entry("Transport Mode Analysis", 'sunburst', lambda: transport_figure(cube)),
+        entry("Tax Burden Analysis", 'distribution',
+              lambda: tax_distribution_figure(selection.frame(df, ['Tax_Load'])['Tax_Load'], int(cube['Rows'].sum()))),
+        entry("Tax Burden Analysis", 'impact', lambda: tax_impact_figure(cube)),
+        entry("Monthly/Yearly Trends", 'seasonal', lambda: seasonal_figure(cube)),
+        entry("Monthly/Yearly Trends", 'yearly', lambda: yearly_figure(cube)),
+    ])
+
+@st.cache_resource(max_entries=1)
+def warm_figures(version):
+    """Build the dashboard and every report's default view once per dataset version.
+
+    The data is loaded on the warming thread too, so the calling page waits
+    for none of it.
+    """
+    def views():
+        cube = load_cube()
+        df, index = load_indexed_data()
+        years = (int(cube['Year'].min()), int(cube['Year'].max()))
+        return dashboard_views(cube, version) + list(figure_views(cube, df, index, years, version).values())
+
+    return warm_in_background(load_figure_cache(), views)
+
+def start_warming():
+    """Pre-render the other pages' default charts; never breaks the calling page."""
+    try:
+        warm_figures(dataset_version())
+    except Exception:
+        # e.g. the data file is missing or unreadable; figures are built on demand
+        pass
+
 def render():
     st.title("📈 Advanced Analytical Reports")
-    
-    df = load_data()
-    
+
+    # Aggregate reports are answered from the pre-aggregated cube; raw rows
+    # are only filtered for the views that need row-level detail, through the
+    # shared row index so a filter touches only the rows it selects
+    df, index = load_indexed_data()
+    cube = load_cube()
+    # Figures are cached as browser-ready JSON, keyed on the filters below
+    figures = load_figure_cache()
+    version = dataset_version()
+
     # Report configuration sidebar
     st.sidebar.header("Report Parameters")
-    report_type = st.sidebar.selectbox("Choose Report Type", [
-        "Top Import Items", 
-        "Country Analysis", 
-        "Price & Value Trends",
-        "Transport Mode Analysis",
-        "Tax Burden Analysis",
-        "Monthly/Yearly Trends"
-    ])
-    
+    report_type = st.sidebar.selectbox("Choose Report Type", REPORT_TYPES)
+
     # Date range selector
-    min_year = int(df['Year'].min())
-    max_year = int(df['Year'].max())
+    min_year = int(cube['Year'].min())
+    max_year = int(cube['Year'].max())
     selected_years = st.sidebar.slider(
         "Select Year Range",
         min_value=min_year,
         max_value=max_year,
         value=(min_year, max_year)
     )
-    
+
     # Filter data based on year selection
-    df = df[(df['Year'] >= selected_years[0]) & (df['Year'] <= selected_years[1])]
+    full_cube = cube
+    # Streaming mode keeps a uniform sample of the rows; aggregates stay exact
+    sampled = len(df) < int(full_cube['Rows'].sum())
+    cube = olap.slice_years(cube, *selected_years)
+    selection = index.select(selected_years)
+
+    def chart(view, **params):
+        views = figure_views(full_cube, df, index, selected_years, version, **params)
+        key, build = views[report_type, view]
+        with span('reports.chart', report=report_type, view=view):
+            cached_chart(figures, key, build, use_container_width=True)
 
     # Dynamic report generation
-    if report_type == "Top Import Items":
-        st.subheader("Top 10 Imported Items by Value")
-        top_items = df.groupby('Item_Description')['CIF_Value_USD'].sum().nlargest(10)
-        fig = px.bar(
-            top_items,
-            orientation='h',
-            color=top_items.values,
-            labels={'value': 'Total Value (USD)', 'index': 'Item'},
-            color_continuous_scale='Bluered'
-        )
-        fig.update_layout(
-            xaxis_title="Total Import Value (USD)",
-            yaxis_title="Product Description"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        with st.expander("Data Summary"):
-            st.write("Top Items Statistical Summary:")
-
-            summary_df = df[df['Item_Description'].isin(top_items.index)].describe(include='all').T
-
-            # Only format numeric columns
-            numeric_cols = summary_df.select_dtypes(include=['float64', 'int64']).columns
-
-            st.dataframe(
-                summary_df.style.format({col: "{:.2f}" for col in numeric_cols})
-            )
-
-    elif report_type == "Country Analysis":
-        st.subheader("Country-wise Import Analysis")
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            selected_country = st.selectbox("Select Country", df['Country_of_Origin'].unique())
-            country_data = df[df['Country_of_Origin'] == selected_country]
-            
-            st.metric("Total Imports Value", f"${country_data['CIF_Value_USD'].sum():,.0f}")
-            st.metric("Average Tax Load", f"${country_data['Tax_Load'].mean():,.0f}")
-            st.metric("Most Common Transport", country_data['Mode_of_Transport'].mode()[0])
-        
-        with col2:
-            fig = px.treemap(
-                country_data,
-                path=['Item_Description'],
-                values='CIF_Value_USD',
-                color='Value_Density',
-                color_continuous_scale='RdBu',
-                title=f"Import Composition from {selected_country}"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    elif report_type == "Price & Value Trends":
-        st.subheader("Price and Value Trend Analysis")
-        
-        # Create period column
-        df['Period'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
-        
-        tab1, tab2 = st.tabs(["Value Trends", "Price Density Analysis"])
-        
-        with tab1:
-            trend_data = df.groupby('Period')['CIF_Value_USD'].sum().reset_index()
-            fig = px.line(
-                trend_data,
-                x='Period', y='CIF_Value_USD',
-                title="Monthly Import Value Trends",
-                markers=True
-            )
-            fig.update_xaxes(title="Month-Year", tickangle=45)
-            fig.update_yaxes(title="Total Import Value (USD)")
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            fig = px.scatter(
-                df,
-                x='Value_Density', y='Unit_Price_UGX',
-                color='Country_of_Origin',
-                trendline="lowess",
-                title="Value Density vs Unit Price",
-                labels={'Value_Density': 'Value per kg (USD/kg)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    elif report_type == "Transport Mode Analysis":
-        st.subheader("Transportation Mode Impact Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            transport_summary = df.groupby('Mode_of_Transport').agg({
-                'CIF_Value_USD': 'sum',
-                'Freight_USD': 'mean',
-                'Import_Duration': 'mean'
-            }).reset_index()
-            
-            st.write("**Transport Mode Statistics:**")
-            st.dataframe(
-                transport_summary.style.format({
-                    'CIF_Value_USD': "${:,.0f}",
-                    'Freight_USD': "${:.2f}",
-                    'Import_Duration': "{:.1f} months"
-                })
-            )
-        
-        with col2:
-            fig = px.sunburst(
-                df,
-                path=['Mode_of_Transport', 'Country_of_Origin'],
-                values='CIF_Value_USD',
-                color='Freight_USD',
-                color_continuous_scale='Viridis'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    elif report_type == "Tax Burden Analysis":
-        st.subheader("Tax Burden Analysis")
-        
-        tab1, tab2 = st.tabs(["Tax Distribution", "Tax Impact"])
-        
-        with tab1:
-            fig = px.histogram(
-                df,
-                x='Tax_Load',
-                nbins=50,
-                title="Distribution of Tax Burden",
-                labels={'Tax_Load': 'Tax Amount (USD)'}
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            tax_impact = df.groupby('Country_of_Origin').agg({
-                'Tax_Load': 'sum',
-                'CIF_Value_USD': 'sum'
-            }).reset_index()
-            
-            tax_impact['Tax_Percentage'] = (tax_impact['Tax_Load'] / tax_impact['CIF_Value_USD']) * 100
-            
-            fig = px.bar(
-                tax_impact.sort_values('Tax_Percentage', ascending=False),
-                x='Country_of_Origin', y='Tax_Percentage',
-                title="Tax as Percentage of Import Value by Country"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    elif report_type == "Monthly/Yearly Trends":
-        st.subheader("Temporal Import Patterns")
-        
-        view_type = st.radio("Select View:", ["Monthly Trends", "Yearly Patterns"])
-        
-        if view_type == "Monthly Trends":
-            df['Month_Name'] = df['Month'].apply(lambda x: datetime(2000, x, 1).strftime('%B'))
-
-            # Correct month order
-            month_order = [
-                "January", "February", "March", "April", "May", "June",
-                "July", "August", "September", "October", "November", "December"
-            ]
-            df['Month_Name'] = pd.Categorical(df['Month_Name'], categories=month_order, ordered=True)
-
-            monthly_data = df.groupby(['Year', 'Month_Name'])['CIF_Value_USD'].sum().reset_index()
-
-            fig = px.line(
-                monthly_data,
-                x='Month_Name', y='CIF_Value_USD',
-                color='Year',
-                markers=True,
-                title="Seasonal Import Patterns"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        else:
-            yearly_data = df.groupby('Year').agg({
-                'CIF_Value_USD': 'sum',
-                'Unit_Price_UGX': 'mean',
-                'Tax_Load': 'sum'
-            }).reset_index()
-            
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=yearly_data['Year'],
-                y=yearly_data['CIF_Value_USD'],
-                name='Total Value'
-            ))
-            fig.add_trace(go.Scatter(
-                x=yearly_data['Year'],
-                y=yearly_data['Unit_Price_UGX'],
-                name='Average Price',
-                yaxis='y2'
-            ))
-            
-            fig.update_layout(
-                title="Yearly Import Trends",
-                yaxis=dict(title="Total Import Value (USD)"),
-                yaxis2=dict(
-                    title="Average Unit Price (UGX)",
-                    overlaying='y',
-                    side='right'
+    with span('reports.render', report=report_type):
+        if report_type == "Top Import Items":
+            st.subheader("Top 10 Imported Items by Value")
+            chart('bar')
+
+            with st.expander("Data Summary"):
+                st.write("Top Items Statistical Summary:")
+
+                top = top_items(cube).index
+                top_rows = selection.isin('Item_Description', top).frame(df)
+                summary_df = top_rows.describe(include='all').T
+                total_rows = int(cube.loc[cube['Item_Description'].isin(top), 'Rows'].sum())
+                if len(top_rows) and total_rows != len(top_rows):
+                    # Streaming mode describes a uniform sample; scale its counts to the full data
+                    for col in ['count', 'freq']:
+                        if col in summary_df:
+                            summary_df[col] = (summary_df[col].astype('float64') * total_rows / len(top_rows)).round()
+                    st.caption(f"Estimated from a uniform sample of {len(top_rows):,} of "
+                               f"{total_rows:,} declarations; counts are scaled to the full data.")
+
+                # Only format numeric columns
+                numeric_cols = summary_df.select_dtypes(include='number').columns
+
+                st.dataframe(
+                    summary_df.style.format({col: "{:.2f}" for col in numeric_cols})
                 )
-            )
-            st.plotly_chart(fig, use_container_width=True)
+
+        elif report_type == "Country Analysis":
+            st.subheader("Country-wise Import Analysis")
+            col1, col2 = st.columns([1, 2])
+
+            with col1:
+                selected_country = st.selectbox("Select Country", cube['Country_of_Origin'].unique())
+                country_cube = cube[cube['Country_of_Origin'] == selected_country]
+                country_totals = country_cube[olap.measure_columns(country_cube)].sum()
+                transport_rows = olap.rollup(country_cube, 'Mode_of_Transport')['Rows']
+
+                st.metric("Total Imports Value", f"${olap.total(country_totals, 'CIF_Value_USD'):,.0f}")
+                st.metric("Average Tax Load", f"${olap.mean(country_totals, 'Tax_Load'):,.0f}")
+                st.metric("Most Common Transport", transport_rows.idxmax())
+
+            with col2:
+                chart('treemap', country=selected_country)
+
+        elif report_type == "Price & Value Trends":
+            st.subheader("Price and Value Trend Analysis")
+
+            tab1, tab2 = st.tabs(["Value Trends", "Price Density Analysis"])
+
+            with tab1:
+                chart('value')
+
+            with tab2:
+                show_bands = st.checkbox("Show confidence bands", value=False)
+                band = " (95% band)" if show_bands else ""
+                trend_stat = st.selectbox("Trend line", ["median", "mean"],
+                                          format_func=lambda stat: f"Binned {stat}{band}")
+                chart('density', trend_stat=trend_stat, show_bands=show_bands)
+                if sampled:
+                    st.caption("Points and trend lines are drawn from a uniform sample of the declarations.")
+
+        elif report_type == "Transport Mode Analysis":
+            st.subheader("Transportation Mode Impact Analysis")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                modes = olap.rollup(cube, 'Mode_of_Transport')
+                transport_summary = pd.DataFrame({
+                    'CIF_Value_USD': olap.total(modes, 'CIF_Value_USD'),
+                    'Freight_USD': olap.mean(modes, 'Freight_USD'),
+                    'Import_Duration': olap.mean(modes, 'Import_Duration')
+                }).reset_index()
+
+                st.write("**Transport Mode Statistics:**")
+                st.dataframe(
+                    transport_summary.style.format({
+                        'CIF_Value_USD': "${:,.0f}",
+                        'Freight_USD': "${:.2f}",
+                        'Import_Duration': "{:.1f} months"
+                    })
+                )
+
+            with col2:
+                chart('sunburst')
+
+        elif report_type == "Tax Burden Analysis":
+            st.subheader("Tax Burden Analysis")
+
+            tab1, tab2 = st.tabs(["Tax Distribution", "Tax Impact"])
+
+            with tab1:
+                chart('distribution')
+
+            with tab2:
+                chart('impact')
+
+        elif report_type == "Monthly/Yearly Trends":
+            st.subheader("Temporal Import Patterns")
+
+            view_type = st.radio("Select View:", ["Monthly Trends", "Yearly Patterns"])
+
+            if view_type == "Monthly Trends":
+                chart('seasonal')
+            else:
+                chart('yearly')
 
     # Add explanatory text
     st.markdown("---")
@@ -246,3 +423,5 @@ def render():
         - Use sidebar filters to focus on specific time periods
         """)
 
+    # Pre-render the other report and dashboard defaults in the background
+    start_warming()
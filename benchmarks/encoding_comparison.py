@@ -0,0 +1,148 @@
+"""Compare the categorical encoding modes of the preprocessor.
+
+For each mode in ``utils.data_loader.ENCODINGS`` this fits the preprocessor
+and a random forest on the earlier part of the history, then reports:
+- transform time and peak memory for the validation rows,
+- the encoded width,
+- the pickled model size,
+- validation RMSE / MAE / R^2 on the most recent rows.
+
+    python benchmarks/encoding_comparison.py [--sample 200000] [--n-estimators 100]
+        [--json results.json] [--save-dir models/variants]
+
+With --save-dir each variant is written as a {'model', 'preprocessor',
+'encoding'} artifact. Any of them can be served by pointing UG_MODEL_PATH at it.
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import RandomForestRegressor  # noqa: E402
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score  # noqa: E402
+
+from utils.columnar_cache import load_imports  # noqa: E402
+from utils.config import DATA_PATH  # noqa: E402
+from utils.data_loader import (ENCODINGS, TARGET, categorical_features,  # noqa: E402
+                               make_preprocessor, numeric_features)
+from utils.features import build_features  # noqa: E402
+
+FEATURES = numeric_features + categorical_features
+
+
+def time_split(df, validation_share):
+    order = np.argsort(df['Import_Duration'].to_numpy(), kind='stable')
+    cut = int(len(order) * (1 - validation_share))
+    return df.iloc[order[:cut]], df.iloc[order[cut:]]
+
+
+def measure_transform(preprocessor, X):
+    tracemalloc.start()
+    start = time.perf_counter()
+    encoded = preprocessor.transform(X)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return encoded, elapsed, peak
+
+
+def encoded_bytes(encoded):
+    if hasattr(encoded, 'indptr'):
+        # CSR matrix
+        return encoded.data.nbytes + encoded.indices.nbytes + encoded.indptr.nbytes
+    return encoded.nbytes
+
+
+def compare(df, encodings, n_estimators, max_depth, validation_share, save_dir=None):
+    train, valid = time_split(df, validation_share)
+    X_train, y_train = build_features(train, FEATURES), train[TARGET].to_numpy()
+    X_valid, y_valid = build_features(valid, FEATURES), valid[TARGET].to_numpy()
+
+    results = []
+    for encoding in encodings:
+        preprocessor = make_preprocessor(encoding)
+        start = time.perf_counter()
+        encoded_train = preprocessor.fit_transform(X_train, y_train)
+        fit_transform_s = time.perf_counter() - start
+
+        encoded_valid, transform_s, peak = measure_transform(preprocessor, X_valid)
+
+        model = RandomForestRegressor(
+            n_estimators=n_estimators, max_depth=max_depth, min_samples_split=5,
+            max_features='log2', bootstrap=False, n_jobs=-1, random_state=42
+        )
+        start = time.perf_counter()
+        model.fit(encoded_train, y_train)
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = model.predict(encoded_valid)
+        predict_s = time.perf_counter() - start
+
+        results.append({
+            'encoding': encoding,
+            'encoded_width': int(encoded_valid.shape[1]),
+            'encoded_mb': encoded_bytes(encoded_valid) / 2**20,
+            'fit_transform_s': fit_transform_s,
+            'transform_s': transform_s,
+            'transform_peak_mb': peak / 2**20,
+            'model_fit_s': fit_s,
+            'predict_s': predict_s,
+            'model_mb': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20,
+            'rmse': float(np.sqrt(mean_squared_error(y_valid, predictions))),
+            'mae': float(mean_absolute_error(y_valid, predictions)),
+            'r2': float(r2_score(y_valid, predictions)),
+        })
+
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+            joblib.dump({'model': model, 'preprocessor': preprocessor, 'encoding': encoding},
+                        os.path.join(save_dir, f'best_price_predictor.{encoding}.pkl'))
+    return results
+
+
+def print_table(results):
+    header = (f"{'encoding':<9} {'width':>6} {'enc MB':>8} {'xform s':>8} {'peak MB':>8} "
+              f"{'model MB':>9} {'RMSE':>12} {'MAE':>12} {'R2':>7}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['encoding']:<9} {r['encoded_width']:>6} {r['encoded_mb']:>8.1f} "
+              f"{r['transform_s']:>8.3f} {r['transform_peak_mb']:>8.1f} {r['model_mb']:>9.1f} "
+              f"{r['rmse']:>12,.0f} {r['mae']:>12,.0f} {r['r2']:>7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare categorical encoding modes.")
+    parser.add_argument('--csv', default=DATA_PATH)
+    parser.add_argument('--encodings', nargs='+', default=ENCODINGS, choices=ENCODINGS)
+    parser.add_argument('--sample', type=int, default=0, help="Use a random sample of N rows")
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=18)
+    parser.add_argument('--validation-share', type=float, default=0.2)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--save-dir')
+    args = parser.parse_args()
+
+    df = load_imports(args.csv)
+    if args.sample and args.sample < len(df):
+        df = df.sample(args.sample, random_state=42)
+
+    results = compare(df, args.encodings, args.n_estimators, args.max_depth,
+                      args.validation_share, args.save_dir)
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'rows': len(df), 'n_estimators': args.n_estimators, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Load generator for utils.predict_service.
+
+Fires ``--requests`` single-declaration requests with ``--concurrency`` in
+flight and reports p50/p95/p99 latency and throughput.
+
+    python -m utils.predict_service &
+    python benchmarks/predict_service_load.py --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.predict_service import DEFAULT_PORT  # noqa: E402
+
+# Same defaults as the single-declaration form on the Price Predictions page
+SAMPLE_DECLARATION = {
+    'HS_Code': '15079090',
+    'Item_Description': 'Machinery Parts',
+    'Country_of_Origin': 'China',
+    'Port_of_Shipment': 'Mombasa',
+    'Quantity_Unit': 'kg',
+    'Quantity': 1,
+    'Net_Mass_kg': 0.15,
+    'Gross_Mass_kg': 0.17,
+    'FOB_Value_USD': 1000.0,
+    'Freight_USD': 200.0,
+    'Insurance_USD': 100.0,
+    'Tax_Rate': 0.18,
+    'Year': 2024,
+    'Month': 1,
+}
+
+
+def summarize(latencies, errors, elapsed):
+    ms = np.asarray(latencies) * 1000
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': float(np.percentile(ms, 50)) if len(ms) else None,
+        'p95_ms': float(np.percentile(ms, 95)) if len(ms) else None,
+        'p99_ms': float(np.percentile(ms, 99)) if len(ms) else None,
+        'max_ms': float(ms.max()) if len(ms) else None,
+    }
+
+
+async def run_load(url, total, concurrency, payload):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    body = json.dumps(payload)
+    remaining = iter(range(total))
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await client.fetch(url, method='POST', body=body,
+                                   headers={'Content-Type': 'application/json'})
+            except (HTTPClientError, OSError):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the prediction service.")
+    parser.add_argument('--url', default=f'http://localhost:{DEFAULT_PORT}/predict')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--payload', help="JSON file with the declaration to send")
+    parser.add_argument('--json', dest='json_path', help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    payload = SAMPLE_DECLARATION
+    if args.payload:
+        with open(args.payload) as f:
+            payload = json.load(f)
+
+    result = asyncio.run(run_load(args.url, args.requests, args.concurrency, payload))
+    result['concurrency'] = args.concurrency
+    print(f"{result['requests']} requests, {result['errors']} errors, "
+          f"{result['throughput_rps']:,.0f} req/s")
+    if result['p50_ms'] is not None:
+        print(f"latency p50 {result['p50_ms']:.1f} ms | p95 {result['p95_ms']:.1f} ms | "
+              f"p99 {result['p99_ms']:.1f} ms")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Latency of prediction ranges next to plain point predictions.
+
+For batches of 1, 1,000 and 100,000 encoded rows drawn from the dataset this
+times, on the model the app serves:
+- ``point``: ``model.predict``;
+- ``interval``: ``utils.compiled_forest.predict_interval`` (point, lower and
+  upper from one traversal of the compiled forest);
+- ``estimator_loop``: the per-tree loop over ``estimators_`` that the
+  vectorized range replaces (only when the sklearn forest is loaded, and only
+  up to ``--loop-max-rows``).
+
+It also checks that the point returned with the range matches
+``model.predict``.
+
+    python benchmarks/prediction_intervals.py [--sizes 1 1000 100000] [--coverage 0.8]
+        [--repeat 20] [--json results.json]
+
+Run it from the directory the app is served from, so models/ resolves.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.compiled_forest import CompiledForest, predict_interval  # noqa: E402
+from utils.config import DATA_PATH, INTERVAL_COVERAGE  # noqa: E402
+from utils.data_loader import read_model  # noqa: E402
+from utils.features import build_features  # noqa: E402
+from utils.ingest import load_dataset  # noqa: E402
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def estimator_loop(model, X, coverage):
+    per_tree = np.column_stack([tree.predict(X) for tree in model.estimators_])
+    bounds = np.quantile(per_tree, [(1 - coverage) / 2, (1 + coverage) / 2], axis=1)
+    return per_tree.mean(axis=1), bounds[0], bounds[1]
+
+
+def run(model, preprocessor, df, sizes, coverage, repeat, loop_max_rows):
+    results = []
+    for size in sizes:
+        batch = df.sample(size, replace=True, random_state=0)
+        X = preprocessor.transform(build_features(batch, preprocessor.feature_names_in_))
+        rounds = repeat if size < 100_000 else max(1, repeat // 10)
+        # First call compiles an sklearn forest; keep it out of the timings
+        point, lower, upper = predict_interval(model, X, coverage)
+        row = {
+            'rows': size,
+            'point_ms': median_ms(lambda: model.predict(X), rounds),
+            'interval_ms': median_ms(lambda: predict_interval(model, X, coverage), rounds),
+            'max_abs_point_error': float(np.max(np.abs(point - model.predict(X)))),
+            'mean_relative_width': float(np.mean((upper - lower) / np.maximum(np.abs(point), 1e-9))),
+        }
+        row['overhead_ms'] = row['interval_ms'] - row['point_ms']
+        if not isinstance(model, CompiledForest) and size <= loop_max_rows:
+            row['estimator_loop_ms'] = median_ms(lambda: estimator_loop(model, X, coverage), rounds)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time prediction ranges against point predictions.")
+    parser.add_argument('--csv-path', default=DATA_PATH)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1, 1_000, 100_000])
+    parser.add_argument('--coverage', type=float, default=INTERVAL_COVERAGE or 0.8)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--loop-max-rows', type=int, default=1_000)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args()
+
+    model, preprocessor = read_model()
+    if model is None:
+        raise SystemExit("Model file not found. Please ensure it exists under /models.")
+    df = load_dataset(args.csv_path)
+    results = run(model, preprocessor, df, args.sizes, args.coverage, args.repeat, args.loop_max_rows)
+
+    print(f"{type(model).__name__}, coverage {args.coverage:.0%}")
+    print(f"{'rows':>8} {'point ms':>10} {'range ms':>10} {'added ms':>10} {'loop ms':>10} {'point err':>10}")
+    for row in results:
+        loop = f"{row['estimator_loop_ms']:>10.2f}" if 'estimator_loop_ms' in row else f"{'-':>10}"
+        print(f"{row['rows']:>8,} {row['point_ms']:>10.2f} {row['interval_ms']:>10.2f} "
+              f"{row['overhead_ms']:>10.2f} {loop} {row['max_abs_point_error']:>10.3g}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'model': type(model).__name__, 'coverage': args.coverage, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""Load test of main.py with many concurrent browser sessions.
+
+Streamlit 1.25 has no AppTest, so this drives a real ``streamlit run``
+server the way a browser does. Each simulated session opens the app's
+websocket (``/_stcore/stream``) and sends rerun requests carrying its widget
+states. Each rerun is timed until the server reports that the script
+finished. Sessions repeat ``--actions`` random steps, with a random think
+time between steps:
+- Dashboard: open the page;
+- Analytical Reports: open the page, then pick a random report type and a
+  random year range in the sidebar;
+- Price Predictions: open the page, then submit the default declaration.
+
+For every ``--sessions`` level a fresh server is started from the current
+directory. One warm-up session first visits every page, so the data and
+model loads are not counted. The server's CPU time and RSS are then sampled
+from /proc while all the sessions run. RSS is read again once every session
+has finished but is still connected. The growth over the warm-up level,
+divided by the number of sessions, is the memory each session costs (its
+widget state and the per-session copies of the filtered frames).
+
+    python benchmarks/session_load.py [--sessions 1 8 32] [--actions 20] [--think 0.5]
+        [--json results.json] [--baseline old.json --tolerance 1.5]
+
+Run it from the directory the app is served from (UG_* variables pass
+through to the server). To load an already running server, use
+--url http://host:8501 and --pid PID; without --pid no CPU or memory figures
+are taken. Process figures need Linux /proc. With --baseline the run fails
+(exit status 1) if any step's p95 became more than ``tolerance`` times slower.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.suite import git_commit  # noqa: E402
+
+SESSION_LEVELS = [1, 8, 32]
+WIDGETS = {'radio', 'selectbox', 'slider', 'button', 'checkbox', 'number_input', 'text_input'}
+
+# Labels as they appear in main.py and the page modules
+NAVIGATION = "Choose a page:"
+PAGES = {'dashboard': 0, 'reports': 1, 'predictions': 2}
+REPORT_TYPE = "Choose Report Type"
+YEAR_RANGE = "Select Year Range"
+PREDICT = "Predict Price"
+
+
+class AppError(Exception):
+    pass
+
+
+# ---- SESSIONS ----
+class Session:
+    """One browser tab: a websocket plus the widget states it would send."""
+
+    def __init__(self, url, rng):
+        self.url = url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream'
+        self.rng = rng
+        self.widgets = {}
+        self.states = {}
+        self.messages = {}
+        self.samples = []
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=1 << 30)
+
+    def close(self):
+        self.ws.close()
+
+    async def rerun(self, step):
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        started = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        seen = {}
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise AppError("server closed the connection")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof('type')
+            if kind == 'ref_hash':
+                # The server only refers to messages it already sent this session
+                fwd = self.messages.get(fwd.ref_hash, fwd)
+                kind = fwd.WhichOneof('type')
+            elif fwd.metadata.cacheable:
+                self.messages[fwd.hash] = fwd
+            if kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception' or (element_type == 'alert' and element.alert.format == 1):
+                    self.errors += 1
+                elif element_type in WIDGETS:
+                    widget = getattr(element, element_type)
+                    seen[widget.id] = widget
+                    self.widgets[widget.label] = widget
+            elif kind == 'script_finished' and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        seconds = time.perf_counter() - started
+        # Like the browser, stop sending states for widgets that were not drawn
+        self.states = {id_: state for id_, state in self.states.items()
+                       if id_ in seen and not state.HasField('trigger_value')}
+        self.samples.append({'step': step, 'seconds': seconds})
+        return seconds
+
+    def set(self, label, **value):
+        widget = self.widgets[label]
+        state = WidgetState(id=widget.id)
+        for field, v in value.items():
+            if field == 'double_array_value':
+                state.double_array_value.data.extend(v)
+            else:
+                setattr(state, field, v)
+        self.states[widget.id] = state
+
+    # ---- STEPS ----
+    async def open(self, page):
+        self.set(NAVIGATION, int_value=PAGES[page])
+        await self.rerun(f'{page}/open')
+
+    async def reports_filter(self):
+        report_types = self.widgets[REPORT_TYPE].options
+        years = self.widgets[YEAR_RANGE]
+        low, high = sorted(self.rng.randint(int(years.min), int(years.max)) for _ in range(2))
+        self.set(REPORT_TYPE, int_value=self.rng.randrange(len(report_types)))
+        self.set(YEAR_RANGE, double_array_value=[low, high])
+        await self.rerun('reports/filter')
+
+    async def predict(self):
+        self.set(PREDICT, trigger_value=True)
+        await self.rerun('predictions/predict')
+
+    async def visit(self, page):
+        await self.open(page)
+        if page == 'reports':
+            await self.reports_filter()
+        elif page == 'predictions':
+            await self.predict()
+
+
+async def run_session(url, actions, think, seed):
+    session = Session(url, random.Random(seed))
+    await session.connect()
+    await session.rerun('dashboard/open')
+    for _ in range(actions):
+        await asyncio.sleep(session.rng.uniform(0, 2 * think))
+        await session.visit(session.rng.choice(list(PAGES)))
+    return session
+
+
+# ---- SERVER ----
+def read_process(pid):
+    """(cpu_seconds, rss_bytes) of ``pid`` from /proc."""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    with open(f'/proc/{pid}/status') as f:
+        rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmRSS:'))
+    return cpu, rss
+
+
+async def sample_process(pid, interval, samples):
+    started = time.perf_counter()
+    while True:
+        cpu, rss = read_process(pid)
+        samples.append({'t': time.perf_counter() - started, 'cpu_s': cpu, 'rss_mb': rss / 2**20})
+        await asyncio.sleep(interval)
+
+
+def start_server(port):
+    command = [sys.executable, '-m', 'streamlit', 'run', os.path.join(ROOT, 'main.py'),
+               '--server.headless', 'true', '--server.port', str(port),
+               '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false']
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(url, timeout=60):
+    client = AsyncHTTPClient()
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            await client.fetch(url.rstrip('/') + '/_stcore/health')
+            return
+        except Exception:
+            if time.perf_counter() > deadline:
+                raise AppError(f"server at {url} did not become healthy within {timeout}s")
+            await asyncio.sleep(0.25)
+
+
+# ---- RUN ----
+def percentiles(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {
+        'count': len(ms),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+    }
+
+
+def summarize(samples):
+    by_step, by_page = {}, {}
+    for sample in samples:
+        by_step.setdefault(sample['step'], []).append(sample['seconds'])
+        by_page.setdefault(sample['step'].split('/')[0], []).append(sample['seconds'])
+    return ({step: percentiles(s) for step, s in sorted(by_step.items())},
+            {page: percentiles(s) for page, s in sorted(by_page.items())})
+
+
+async def load_level(url, pid, n_sessions, actions, think, seed, interval):
+    warm_started = time.perf_counter()
+    warmup = await run_session(url, 0, 0, seed)
+    for page in PAGES:
+        await warmup.visit(page)
+    warmup_s = time.perf_counter() - warm_started
+    process = read_process(pid) if pid else None
+
+    timeline = []
+    sampler = asyncio.ensure_future(sample_process(pid, interval, timeline)) if pid else None
+    started = time.perf_counter()
+    sessions = await asyncio.gather(*[run_session(url, actions, think, seed + 1 + i) for i in range(n_sessions)])
+    elapsed = time.perf_counter() - started
+    if sampler:
+        sampler.cancel()
+        # Read while every session is still connected and holding its state
+        after = read_process(pid)
+    for session in sessions + [warmup]:
+        session.close()
+
+    samples = [sample for session in sessions for sample in session.samples]
+    steps, pages = summarize(samples)
+    level = {
+        'sessions': n_sessions,
+        'actions_per_session': actions,
+        'think_s': think,
+        'warmup_s': warmup_s,
+        'elapsed_s': elapsed,
+        'reruns': len(samples),
+        'reruns_per_s': len(samples) / elapsed if elapsed else 0.0,
+        'errors': sum(session.errors for session in sessions),
+        'pages': pages,
+        'steps': steps,
+    }
+    if pid:
+        cpu_s = after[0] - process[0]
+        level['process'] = {
+            'cpu_s': cpu_s,
+            'cpu_cores': cpu_s / elapsed if elapsed else 0.0,
+            'rss_warm_mb': process[1] / 2**20,
+            'rss_peak_mb': max([process[1], after[1]] + [s['rss_mb'] * 2**20 for s in timeline]) / 2**20,
+            'rss_after_mb': after[1] / 2**20,
+            'rss_growth_per_session_mb': (after[1] - process[1]) / 2**20 / n_sessions,
+            'timeline': timeline,
+        }
+    return level
+
+
+async def run_levels(args):
+    levels = []
+    for n_sessions in args.sessions:
+        server = None
+        url, pid = args.url, args.pid
+        if not url:
+            server = start_server(args.port)
+            url, pid = f'http://localhost:{args.port}', server.pid
+        try:
+            await wait_ready(url)
+            level = await load_level(url, pid, n_sessions, args.actions, args.think, args.seed,
+                                     args.sample_interval)
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+        levels.append(level)
+        print_level(level)
+    return levels
+
+
+def print_level(level):
+    print(f"\n{level['sessions']} sessions: {level['reruns']} reruns in {level['elapsed_s']:.1f}s "
+          f"({level['reruns_per_s']:.1f}/s), {level['errors']} errors")
+    process = level.get('process')
+    if process:
+        print(f"  server CPU {process['cpu_cores']:.2f} cores, RSS {process['rss_warm_mb']:.0f} -> "
+              f"{process['rss_after_mb']:.0f} MB (peak {process['rss_peak_mb']:.0f}, "
+              f"{process['rss_growth_per_session_mb']:+.1f} MB per session)")
+    print(f"  {'step':<24} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for step, result in level['steps'].items():
+        print(f"  {step:<24} {result['count']:>6} {result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} "
+              f"{result['p99_ms']:>9.0f} {result['max_ms']:>9.0f}")
+
+
+def regressions(levels, baseline, tolerance):
+    previous = {level['sessions']: level['steps'] for level in baseline['levels']}
+    problems = []
+    for level in levels:
+        old = previous.get(level['sessions'], {})
+        for step, result in level['steps'].items():
+            if step in old and result['p95_ms'] > old[step]['p95_ms'] * tolerance:
+                problems.append(f"{level['sessions']} sessions {step}: p95 {result['p95_ms']:.0f} ms "
+                                f"vs {old[step]['p95_ms']:.0f} ms baseline")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent sessions.")
+    parser.add_argument('--sessions', nargs='+', type=int, default=SESSION_LEVELS)
+    parser.add_argument('--actions', type=int, default=20, help="Page visits per session")
+    parser.add_argument('--think', type=float, default=0.5, help="Mean seconds between visits")
+    parser.add_argument('--port', type=int, default=8599, help="Port for the servers this starts")
+    parser.add_argument('--url', help="Load an already running server instead of starting one")
+    parser.add_argument('--pid', type=int, help="Process id of the --url server, for CPU and RSS")
+    parser.add_argument('--sample-interval', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline', help="Earlier --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    args = parser.parse_args()
+
+    levels = asyncio.run(run_levels(args))
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'seed': args.seed,
+        'levels': levels,
+    }
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {'levels': []}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    problems = regressions(levels, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
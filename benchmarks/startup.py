@@ -0,0 +1,129 @@
+"""Import time and time-to-first-render for each page of the app.
+
+Every page runs in a fresh interpreter, as a new Streamlit worker would. The
+child process measures:
+- import_s: importing the page module (Streamlit included);
+- render_s: one ``render()`` call in bare mode, where widgets return their
+  defaults and the data and model are loaded cold;
+- which heavy modules were loaded by the import alone.
+
+Run it from the directory the app is served from, so data/ and models/
+resolve as they do for ``streamlit run main.py``.
+
+    python benchmarks/startup.py [--pages dashboard reports] [--repeat 3]
+        [--json results.json] [--baseline old.json --tolerance 1.5]
+
+With --baseline the run fails (exit status 1) if any page became more than
+``tolerance`` times slower than the baseline. It also fails if importing a
+page pulls in a module from LAZY_MODULES, which must load only on first use.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ['dashboard', 'reports', 'predictions', 'about']
+
+# Must not be imported just by importing a page
+LAZY_MODULES = ['sklearn', 'joblib']
+
+WATCHED_MODULES = LAZY_MODULES + ['plotly.express', 'plotly.graph_objects', 'pyarrow', 'tornado']
+
+
+def run_child(page):
+    import logging
+    # Bare-mode Streamlit warns about the missing runtime on every call
+    logging.disable(logging.WARNING)
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    streamlit_s = time.perf_counter() - start
+    module = __import__(f'app.pages.{page}', fromlist=['render'])
+    import_s = time.perf_counter() - start
+    loaded = [name for name in WATCHED_MODULES if name in sys.modules]
+
+    start = time.perf_counter()
+    module.render()
+    render_s = time.perf_counter() - start
+    print(json.dumps({
+        'page': page,
+        'streamlit_import_s': streamlit_s,
+        'import_s': import_s,
+        'render_s': render_s,
+        'loaded_on_import': loaded,
+    }))
+
+
+def measure(page):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', page],
+        check=True, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': ROOT}
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    return {
+        'page': runs[0]['page'],
+        'import_s': statistics.median(run['import_s'] for run in runs),
+        'render_s': statistics.median(run['render_s'] for run in runs),
+        'streamlit_import_s': statistics.median(run['streamlit_import_s'] for run in runs),
+        'loaded_on_import': runs[0]['loaded_on_import'],
+    }
+
+
+def regressions(results, baseline, tolerance):
+    previous = {result['page']: result for result in baseline['results']}
+    problems = []
+    for result in results:
+        eager = [name for name in LAZY_MODULES if name in result['loaded_on_import']]
+        if eager:
+            problems.append(f"{result['page']}: imports {', '.join(eager)} eagerly")
+        old = previous.get(result['page'])
+        for key in ('import_s', 'render_s'):
+            if old and result[key] > old[key] * tolerance:
+                problems.append(f"{result['page']}: {key} {result[key]:.2f}s vs {old[key]:.2f}s baseline")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-page import and first-render timings.")
+    parser.add_argument('--pages', nargs='+', default=PAGES, choices=PAGES)
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh processes per page; medians are reported")
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline', help="Earlier --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = [summarize([measure(page) for _ in range(args.repeat)]) for page in args.pages]
+    print(f"{'page':<12} {'import s':>9} {'render s':>9}  heavy modules on import")
+    for r in results:
+        print(f"{r['page']:<12} {r['import_s']:>9.2f} {r['render_s']:>9.2f}  "
+              f"{', '.join(r['loaded_on_import']) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'repeat': args.repeat, 'results': results}, f, indent=2)
+
+    baseline = {'results': []}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    problems = regressions(results, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
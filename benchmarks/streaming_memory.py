@@ -0,0 +1,127 @@
+"""Peak memory of the in-memory and streaming aggregation paths.
+
+Synthetic inputs of growing size are written by repeating the rows of a
+source CSV. Each pass through the source moves its years past the previous
+pass, so the history gets longer and the cube grows with the rows, as it
+would in production.
+Each (mode, size) pair then runs in a fresh interpreter, which builds the
+dashboard/report aggregates and reports its peak RSS:
+- memory: parse the whole CSV, add the derived features, build the cube;
+- stream: utils.streaming.stream_summary, chunk by chunk.
+
+    python benchmarks/streaming_memory.py [--rows 200000 1000000 5000000]
+        [--modes memory stream] [--chunk-rows 200000] [--json results.json]
+
+In streaming mode the peak RSS should grow only with the cube, not with the
+rows, and the time should grow linearly with the rows.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import DATA_PATH, STREAM_SAMPLE_ROWS  # noqa: E402
+
+MODES = ['memory', 'stream']
+
+
+def write_replicated(source, path, n_rows, chunksize=100_000):
+    """Write ``n_rows`` rows to ``path`` by cycling through ``source``.
+
+    Pass ``k`` shifts Year by ``k`` times the source's span of years, so
+    every pass adds new (Year, Month) cells.
+    """
+    years = pd.read_csv(source, usecols=['Year'])['Year']
+    span = int(years.max() - years.min() + 1)
+    written, shift = 0, 0
+    with open(path, 'w', newline='') as f:
+        while written < n_rows:
+            for chunk in pd.read_csv(source, chunksize=chunksize):
+                chunk = chunk.iloc[:n_rows - written]
+                chunk['Year'] += shift
+                chunk.to_csv(f, header=written == 0, index=False)
+                written += len(chunk)
+                if written >= n_rows:
+                    break
+            shift += span
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode, csv_path, chunk_rows, sample_rows):
+    start = time.perf_counter()
+    if mode == 'memory':
+        from utils.columnar_cache import prepare_frame
+        from utils.cube import build_cube
+        df, _ = prepare_frame(csv_path)
+        rows, cells = len(df), len(build_cube(df))
+    else:
+        from utils.streaming import stream_summary
+        # An empty cache dir keeps the benchmark away from any ingest manifest
+        with tempfile.TemporaryDirectory() as cache_dir:
+            summary = stream_summary(csv_path, chunk_rows, sample_rows, cache_dir=cache_dir)
+        rows, cells = summary.rows, len(summary.cube)
+    print(json.dumps({
+        'mode': mode,
+        'rows': rows,
+        'cube_cells': cells,
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def measure(mode, csv_path, chunk_rows, sample_rows):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, csv_path,
+         '--chunk-rows', str(chunk_rows), '--sample-rows', str(sample_rows)],
+        check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of in-memory vs streaming aggregation.")
+    parser.add_argument('--source', default=DATA_PATH)
+    parser.add_argument('--rows', nargs='+', type=int, default=[200_000, 1_000_000, 5_000_000])
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--chunk-rows', type=int, default=200_000)
+    parser.add_argument('--sample-rows', type=int, default=STREAM_SAMPLE_ROWS)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'CSV'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.chunk_rows, args.sample_rows)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            csv_path = os.path.join(tmp, f'imports_{n_rows}.csv')
+            write_replicated(args.source, csv_path, n_rows)
+            for mode in args.modes:
+                result = measure(mode, csv_path, args.chunk_rows, args.sample_rows)
+                results.append(result)
+                print(f"{mode:<7} {result['rows']:>12,} rows  {result['cube_cells']:>10,} cells  "
+                      f"{result['seconds']:>8.1f} s  {result['peak_rss_mb']:>9,.0f} MB peak RSS")
+            os.remove(csv_path)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'chunk_rows': args.chunk_rows, 'sample_rows': args.sample_rows,
+                       'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
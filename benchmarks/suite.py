@@ -0,0 +1,252 @@
+"""Timings for data loading, every report, the dashboard and model.predict.
+
+For each scale a synthetic dataset is generated with benchmarks/synthetic.py
+(kept under --data-dir and reused by later runs). A fresh interpreter then
+points UG_DATA_PATH at it, with its own cache directory, and times:
+- load/*: ``load_data`` from the CSV (cold, which also writes the columnar
+  cache) and again from the Streamlit cache (warm), then ``load_cube`` and
+  ``load_indexed_data``, cold and warm;
+- dashboard/*: the three helpers in utils.visualization, each fetching the
+  cube through ``load_cube`` as a page rerun does;
+- reports/*: each of the six branches of ``reports.render``, drawing every
+  figure from scratch, and again with the figures already in the figure
+  cache (``/cached``). The background figure warmer is switched off, so it
+  does not compete with the timed render;
+- predict/*: build_features + transform + predict for batches of 1, 1,000
+  and 100,000 declarations, and the same with the prediction range
+  (``/interval``).
+
+Streamlit runs headless, so widgets return their defaults. The child
+installs a script-run context, so st.cache_data and st.cache_resource cache
+as they do on a live server. Bare mode would recompute on every call. The
+page loaders run unpatched, so each timed render includes what the caches
+cost per rerun, such as the copy st.cache_data returns.
+
+    python benchmarks/suite.py [--rows 10000 1000000 10000000] [--repeat 5]
+        [--json results.json] [--baseline old.json --tolerance 1.5]
+
+Run it from the directory the app is served from, so models/ resolves. The
+10M-row scale needs several GB of memory for the in-memory loaders. With
+--baseline the run fails (exit status 1) if any timing present in both runs
+became more than ``tolerance`` times slower.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import write_csv  # noqa: E402
+
+SCALES = [10_000, 1_000_000, 10_000_000]
+BATCH_SIZES = [1, 1_000, 100_000]
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(times), 'min_s': min(times), 'repeat': repeat}
+
+
+def run_child(n_rows, repeat):
+    import logging
+    from unittest import mock
+
+    # Headless Streamlit warns about the missing runtime on every call
+    logging.disable(logging.WARNING)
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import ScriptRunContext, add_script_run_ctx
+    from streamlit.runtime.state import SafeSessionState, SessionState
+    from streamlit.runtime.uploaded_file_manager import UploadedFileManager
+    import app.pages.reports as reports
+    import utils.visualization as visualization
+    from utils.compiled_forest import predict_interval
+    from utils.config import INTERVAL_COVERAGE
+    from utils.data_loader import load_cube, load_data, load_indexed_data, read_model
+    from utils.features import build_features
+    from utils.figure_cache import FigureCache
+
+    # With a script-run context the Streamlit caches hold values between calls
+    ctx = ScriptRunContext(
+        session_id='benchmark', _enqueue=lambda msg: None, query_string='',
+        session_state=SafeSessionState(SessionState()), uploaded_file_mgr=mock.Mock(spec=UploadedFileManager),
+        page_script_hash='', user_info={'email': None},
+    )
+    add_script_run_ctx(threading.current_thread(), ctx)
+
+    def rerun(render):
+        # Each call is a new script run, so widget ids may repeat
+        def run():
+            ctx.reset()
+            render()
+        return run
+
+    results = {}
+    results['load/data_cold'] = timed(load_data, 1)
+    results['load/data_warm'] = timed(load_data, repeat)
+    results['load/cube_cold'] = timed(load_cube, 1)
+    results['load/cube'] = timed(load_cube, repeat)
+    results['load/indexed_data'] = timed(load_indexed_data, repeat)
+
+    df, _ = load_indexed_data()
+    figures = FigureCache()
+    # The background figure warmer would build every view during the timings
+    mock.patch.object(reports, 'start_warming').start()
+    for name in ['plot_import_trends', 'show_geo_distribution', 'display_kpi_cards']:
+        helper = getattr(visualization, name)
+        with mock.patch.object(visualization, 'load_figure_cache', side_effect=FigureCache):
+            results[f'dashboard/{name}'] = timed(rerun(lambda: helper(load_cube())), repeat)
+
+    for report_type in reports.REPORT_TYPES:
+        with mock.patch.object(st.sidebar, 'selectbox', return_value=report_type):
+            # A new, empty figure cache per call: every figure is built
+            with mock.patch.object(reports, 'load_figure_cache', side_effect=FigureCache):
+                results[f'reports/{report_type}'] = timed(rerun(reports.render), repeat)
+            with mock.patch.object(reports, 'load_figure_cache', return_value=figures):
+                rerun(reports.render)()
+                results[f'reports/{report_type}/cached'] = timed(rerun(reports.render), repeat)
+
+    notes = []
+    try:
+        model, preprocessor = read_model()
+    except Exception as e:
+        # e.g. a Git LFS pointer checked out in place of the pickle
+        model, notes = None, [f"predict/* skipped: the model could not be loaded ({e!r})"]
+    if model is None and not notes:
+        notes.append("predict/* skipped: no model found under models/")
+    if model is not None:
+        for size in BATCH_SIZES:
+            batch = df.sample(size, replace=True, random_state=0)
+
+            def predict():
+                X = build_features(batch, preprocessor.feature_names_in_)
+                return model.predict(preprocessor.transform(X))
+
+            def predict_with_range():
+                X = build_features(batch, preprocessor.feature_names_in_)
+                return predict_interval(model, preprocessor.transform(X), INTERVAL_COVERAGE or 0.8)
+
+            rounds = repeat if size < 100_000 else max(1, repeat // 2)
+            results[f'predict/batch_{size}'] = timed(predict, rounds)
+            results[f'predict/batch_{size}/interval'] = timed(predict_with_range, rounds)
+
+    print(json.dumps({'rows': n_rows, 'loaded_rows': len(df), 'results': results, 'notes': notes}))
+
+
+def measure(n_rows, csv_path, cache_dir, repeat):
+    env = {
+        **os.environ,
+        'PYTHONPATH': ROOT,
+        'UG_DATA_PATH': csv_path,
+        'UG_CACHE_DIR': cache_dir,
+        # Keep the run away from ingested partitions, snapshots and disk caches
+        'UG_PARTITION_DIR': os.path.join(cache_dir, 'no-partitions'),
+        'UG_SHARED_DIR': '',
+        'UG_STREAMING': '0',
+        'UG_FIGURE_CACHE_PATH': '',
+        'UG_PREDICTION_CACHE_PATH': '',
+    }
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', str(n_rows), '--repeat', str(repeat)],
+        capture_output=True, text=True, env=env
+    )
+    if out.returncode:
+        sys.stderr.write(out.stderr)
+        raise SystemExit(f"Benchmark child for {n_rows:,} rows failed with exit status {out.returncode}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def regressions(runs, baseline, tolerance):
+    previous = {run['rows']: run['results'] for run in baseline['runs']}
+    problems = []
+    for run in runs:
+        old = previous.get(run['rows'], {})
+        for name, result in run['results'].items():
+            if name in old and result['median_s'] > old[name]['median_s'] * tolerance:
+                problems.append(f"{run['rows']:,} rows {name}: {result['median_s']:.3f}s "
+                                f"vs {old[name]['median_s']:.3f}s baseline")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, reports and prediction on synthetic data.")
+    parser.add_argument('--rows', nargs='+', type=int, default=SCALES)
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per timing; medians are reported")
+    parser.add_argument('--data-dir', default=os.path.join('data', 'benchmarks'),
+                        help="Where the synthetic CSVs and their caches are kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline', help="Earlier --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat)
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    runs = []
+    for n_rows in args.rows:
+        csv_path = os.path.abspath(os.path.join(args.data_dir, f'synthetic_{n_rows}_seed{args.seed}.csv'))
+        if not os.path.exists(csv_path):
+            print(f"Generating {n_rows:,} rows...")
+            write_csv(csv_path, n_rows, args.seed)
+        cache_dir = os.path.abspath(os.path.join(args.data_dir, f'cache_{n_rows}_seed{args.seed}'))
+        # Start from no columnar cache so load/data_cold really is cold
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        run = measure(n_rows, csv_path, cache_dir, args.repeat)
+        runs.append(run)
+
+        print(f"\n{n_rows:,} rows")
+        for name, result in run['results'].items():
+            print(f"  {name:<42} {result['median_s'] * 1000:>10.1f} ms")
+        for note in run.get('notes', []):
+            print(f"  NOTE {note}")
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'runs': runs,
+    }
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {'runs': []}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    problems = regressions(runs, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Synthetic import declarations in the schema of the training CSV.
+
+Rows are drawn from a fixed catalogue of HS codes (each with its own item
+description, typical value per kg and tariff), trading partners, ports and
+transport modes, so the reports see a realistic number of groups and the
+model sees values in a plausible range. The output only depends on
+``n_rows`` and ``seed``, and rows are written in chunks so 10M-row files do
+not need to fit in memory.
+
+    python benchmarks/synthetic.py --rows 1000000 --out data/synthetic_1M.csv [--seed 0]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    'HS_Code', 'Item_Description', 'Country_of_Origin', 'Port_of_Shipment',
+    'Quantity_Unit', 'Quantity', 'Net_Mass_kg', 'Gross_Mass_kg',
+    'FOB_Value_USD', 'Freight_USD', 'Insurance_USD', 'CIF_Value_USD',
+    'Tax_Rate', 'Mode_of_Transport', 'Currency_Code', 'Valuation_Method',
+    'Year', 'Month', 'Unit_Price_UGX', 'CIF_Value_UGX', 'Date'
+]
+
+COUNTRIES = [
+    'China', 'India', 'Kenya', 'United Arab Emirates', 'Japan', 'Germany',
+    'South Africa', 'Tanzania', 'United States', 'Belgium', 'United Kingdom',
+    'Netherlands', 'Turkey', 'Egypt', 'Indonesia', 'Malaysia', 'Italy',
+    'France', 'Saudi Arabia', 'Pakistan'
+]
+# Share of declarations per country, heavily skewed like real trade
+COUNTRY_WEIGHTS = 1 / np.arange(1, len(COUNTRIES) + 1)
+
+PORTS = ['Mombasa', 'Dar es Salaam', 'Entebbe', 'Busia', 'Malaba', 'Mutukula']
+TRANSPORT = ['SEA', 'ROAD', 'AIR', 'RAIL']
+TRANSPORT_WEIGHTS = [0.45, 0.35, 0.15, 0.05]
+CURRENCIES = ['USD', 'EUR', 'CNY', 'GBP']
+VALUATION_METHODS = ['CIF', 'FOB', 'Transaction Value']
+UNITS = ['kg', 'pcs', 'ltr', 'm2']
+TARIFFS = [0.0, 0.1, 0.18, 0.25, 0.35]
+
+N_PRODUCTS = 500
+YEARS = (2014, 2024)
+UGX_PER_USD = 3700.0
+
+
+def catalogue(seed=0):
+    """One row per product: HS code, description, unit, price level and tariff."""
+    rng = np.random.default_rng(seed)
+    codes = np.sort(rng.choice(np.arange(10_000_000, 99_999_999), N_PRODUCTS, replace=False))
+    return pd.DataFrame({
+        'HS_Code': codes.astype(str),
+        'Item_Description': [f'Product {code % 10_000:04d}-{i}' for i, code in enumerate(codes)],
+        'Quantity_Unit': rng.choice(UNITS, N_PRODUCTS),
+        'usd_per_kg': rng.lognormal(2.5, 1.5, N_PRODUCTS),
+        'Tax_Rate': rng.choice(TARIFFS, N_PRODUCTS),
+    })
+
+
+def generate_chunk(products, n_rows, rng):
+    product = products.iloc[rng.zipf(1.3, n_rows) % len(products)].reset_index(drop=True)
+    country_p = COUNTRY_WEIGHTS / COUNTRY_WEIGHTS.sum()
+    year = rng.integers(YEARS[0], YEARS[1] + 1, n_rows)
+    month = rng.integers(1, 13, n_rows)
+    gross = rng.lognormal(5, 1.8, n_rows)
+    fob = gross * product['usd_per_kg'].to_numpy() * rng.lognormal(0, 0.4, n_rows)
+    freight = fob * rng.uniform(0.03, 0.2, n_rows)
+    insurance = fob * rng.uniform(0.005, 0.02, n_rows)
+    cif = fob + freight + insurance
+    quantity = np.maximum(1, (gross / rng.uniform(0.5, 50, n_rows)).round()).astype('int64')
+    return pd.DataFrame({
+        'HS_Code': product['HS_Code'],
+        'Item_Description': product['Item_Description'],
+        'Country_of_Origin': rng.choice(COUNTRIES, n_rows, p=country_p),
+        'Port_of_Shipment': rng.choice(PORTS, n_rows),
+        'Quantity_Unit': product['Quantity_Unit'],
+        'Quantity': quantity,
+        'Net_Mass_kg': gross * rng.uniform(0.85, 0.98, n_rows),
+        'Gross_Mass_kg': gross,
+        'FOB_Value_USD': fob,
+        'Freight_USD': freight,
+        'Insurance_USD': insurance,
+        'CIF_Value_USD': cif,
+        'Tax_Rate': product['Tax_Rate'],
+        'Mode_of_Transport': rng.choice(TRANSPORT, n_rows, p=TRANSPORT_WEIGHTS),
+        'Currency_Code': rng.choice(CURRENCIES, n_rows),
+        'Valuation_Method': rng.choice(VALUATION_METHODS, n_rows),
+        'Year': year,
+        'Month': month,
+        'Unit_Price_UGX': cif * UGX_PER_USD / quantity,
+        'CIF_Value_UGX': cif * UGX_PER_USD,
+        'Date': pd.to_datetime({'year': year, 'month': month, 'day': 1}).dt.strftime('%Y-%m-%d'),
+    }, columns=COLUMNS)
+
+
+def generate(n_rows, seed=0, chunk_rows=1_000_000):
+    """Yield DataFrame chunks that together hold ``n_rows`` rows."""
+    products = catalogue(seed)
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        # Seeded per chunk, so a chunk does not depend on the ones before it
+        rng = np.random.default_rng([seed, i])
+        yield generate_chunk(products, min(chunk_rows, n_rows - start), rng)
+
+
+def write_csv(path, n_rows, seed=0, chunk_rows=1_000_000):
+    """Write the dataset to ``path`` atomically and return the path."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as f:
+        for i, chunk in enumerate(generate(n_rows, seed, chunk_rows)):
+            chunk.to_csv(f, header=i == 0, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic imports CSV.")
+    parser.add_argument('--rows', type=int, required=True)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_csv(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
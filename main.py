@@ -1,5 +1,6 @@
 import streamlit as st
-from PIL import Image
+from utils.config import PERFORMANCE_PAGE
+from utils.telemetry import start_metrics_server
 
 # Page configuration
 st.set_page_config(
@@ -13,12 +14,17 @@ st.set_page_config(
 with open('app/assets/style.css') as f:
     st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
+# /metrics for Prometheus when UG_METRICS and UG_METRICS_PORT are set
+start_metrics_server()
+
 # Sidebar Navigation
 st.sidebar.title("Navigation")
-page = st.sidebar.radio("Choose a page:", 
-    ["📊 Dashboard", "📈 Analytical Reports", "🔮 Price Predictions", "🌍 About Project"])
+pages = ["📊 Dashboard", "📈 Analytical Reports", "🔮 Price Predictions", "🌍 About Project"]
+if PERFORMANCE_PAGE:
+    pages.append("⏱️ Performance")
+page = st.sidebar.radio("Choose a page:", pages)
 
-# Route to pages
+# Route to pages; each page module is imported only when it is shown
 if page == "📊 Dashboard":
     import app.pages.dashboard as dashboard
     dashboard.render()
@@ -31,6 +37,9 @@ elif page == "🔮 Price Predictions":
 elif page == "🌍 About Project":
     import app.pages.about as about
     about.render()
+elif page == "⏱️ Performance":
+    import app.pages.performance as performance
+    performance.render()
 
 # Global footer
 st.markdown("""
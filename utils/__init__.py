@@ -1,6 +1,29 @@
-from .data_loader import (
-    load_data,
-    load_model,
-    preprocess_data,
-    preprocessor
-)
\ No newline at end of file
+"""Data and model helpers for the app.
+
+The loaders below live in ``utils.data_loader``, which pulls in Streamlit.
+They are resolved on first access, so importing a light submodule such as
+``utils.cube`` or ``utils.features`` does not load the app stack.
+"""
+_LOADERS = [
+    'load_data',
+    'load_indexed_data',
+    'load_cube',
+    'load_model',
+    'warm_model',
+    'load_prediction_cache',
+    'load_figure_cache',
+    'load_screening',
+    'dataset_version',
+    'model_version',
+    'preprocess_data',
+    'preprocessor',
+]
+
+__all__ = list(_LOADERS)
+
+
+def __getattr__(name):
+    if name in _LOADERS:
+        from . import data_loader
+        return getattr(data_loader, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
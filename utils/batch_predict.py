@@ -0,0 +1,104 @@
+"""Chunked batch scoring of declaration files.
+
+The input CSV is streamed ``chunksize`` rows at a time. Each chunk gets its
+derived features in one vectorized pass, a single ``transform``/``predict``
+call, and is appended to the output CSV straight away, so memory stays
+bounded by the chunk size rather than the file size.
+
+With a coverage above 0 (UG_INTERVAL_COVERAGE, or --coverage), each row also
+gets the central range of its per-tree predictions as lower/upper columns.
+These come from the same tree traversal as the point prediction.
+
+    python -m utils.batch_predict declarations.csv scored.csv [--chunksize 50000] [--coverage 0.8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from utils.config import INTERVAL_COVERAGE
+from utils.features import build_features, missing_inputs
+from utils.telemetry import span
+
+PREDICTION_COLUMN = 'Predicted_Unit_Price_UGX'
+LOWER_COLUMN = 'Predicted_Unit_Price_UGX_Lower'
+UPPER_COLUMN = 'Predicted_Unit_Price_UGX_Upper'
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def score_chunk(chunk, model, preprocessor, coverage=INTERVAL_COVERAGE):
+    """Input columns plus the prediction (and its range when ``coverage`` is
+    set); derived features are not written out."""
+    with span('predict.features', mode='batch'):
+        features = build_features(chunk, preprocessor.feature_names_in_)
+    with span('predict.transform', mode='batch'):
+        processed = preprocessor.transform(features)
+    if not coverage:
+        with span('predict.model', mode='batch'):
+            chunk[PREDICTION_COLUMN] = model.predict(processed)
+        return chunk
+    from utils.compiled_forest import predict_interval
+    with span('predict.interval', mode='batch'):
+        chunk[PREDICTION_COLUMN], chunk[LOWER_COLUMN], chunk[UPPER_COLUMN] = \
+            predict_interval(model, processed, coverage)
+    return chunk
+
+
+def score_stream(source, sink, model, preprocessor, chunksize=DEFAULT_CHUNKSIZE, on_progress=None,
+                 coverage=INTERVAL_COVERAGE):
+    """Score CSV ``source`` into CSV ``sink`` chunk by chunk; returns rows scored.
+
+    ``on_progress(rows_done, bytes_read)`` is called after every chunk.
+    """
+    rows = 0
+    for i, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        if i == 0:
+            missing = missing_inputs(chunk, preprocessor.feature_names_in_)
+            if missing:
+                raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+        score_chunk(chunk, model, preprocessor, coverage).to_csv(sink, header=(i == 0), index=False)
+        rows += len(chunk)
+        if on_progress:
+            on_progress(rows, source.tell() if hasattr(source, 'tell') else None)
+    return rows
+
+
+def score_file(input_path, output_path, model, preprocessor, chunksize=DEFAULT_CHUNKSIZE, on_progress=None,
+               coverage=INTERVAL_COVERAGE):
+    with open(input_path, 'rb') as source, open(output_path, 'w', newline='') as sink:
+        return score_stream(source, sink, model, preprocessor, chunksize, on_progress, coverage)
+
+
+def main():
+    from utils.data_loader import read_model
+
+    parser = argparse.ArgumentParser(description="Score a CSV of declarations in chunks.")
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--coverage', type=float, default=INTERVAL_COVERAGE,
+                        help="Share of per-tree predictions inside the lower/upper columns; 0 omits them")
+    args = parser.parse_args()
+
+    model, preprocessor = read_model()
+    if model is None:
+        raise SystemExit("Model file not found. Please ensure it exists under /models.")
+
+    total_bytes = os.path.getsize(args.input_path)
+    start = time.perf_counter()
+
+    def report(rows, bytes_read):
+        elapsed = time.perf_counter() - start
+        share = f"{100 * bytes_read / total_bytes:5.1f}% " if bytes_read and total_bytes else ""
+        print(f"\r{share}{rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/s)",
+              end='', file=sys.stderr, flush=True)
+
+    rows = score_file(args.input_path, args.output_path, model, preprocessor, args.chunksize, report,
+                      args.coverage)
+    print(f"\nWrote {rows:,} predictions to {args.output_path}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
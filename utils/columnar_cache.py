@@ -0,0 +1,154 @@
+"""Columnar on-disk cache for the imports dataset.
+
+The raw CSV is parsed once, the derived features are added, the rows are
+sorted by (Year, Month) and the result is written as an uncompressed Arrow IPC
+file next to a fingerprint of the source.
+Later loads memory-map that file instead of re-parsing the CSV, and the cache
+is rebuilt only when the CSV content changes. In compact mode the frame is
+narrowed with utils.schema first, and the string dictionaries are stored as
+Arrow dictionary columns so they load straight back as categoricals.
+
+Build or refresh the cache ahead of a deploy with:
+
+    python -m utils.columnar_cache [path/to/imports.csv] [--compact] [--force]
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.config import CACHE_DIR, COMPACT_SCHEMA, DATA_PATH
+from utils.features import add_derived_features
+from utils.row_index import sort_by_time
+from utils.schema import compact_frame, memory_report
+
+# Bump whenever the cached layout or the derived features change
+CACHE_FORMAT = 3
+META_KEY = b'ug_cache'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(csv_path, compact=False, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    suffix = '.compact.arrow' if compact else '.arrow'
+    return os.path.join(cache_dir, name + suffix)
+
+
+def read_metadata(cache_path):
+    """Return the fingerprint stored in a cache file, or None if unreadable."""
+    try:
+        with pa.memory_map(cache_path, 'r') as source:
+            schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    raw = (schema.metadata or {}).get(META_KEY)
+    return json.loads(raw) if raw else None
+
+
+def is_fresh(csv_path, cache_path, compact=False):
+    meta = read_metadata(cache_path)
+    if meta is None or meta.get('format') != CACHE_FORMAT or meta.get('compact') != compact:
+        return False
+    stat = os.stat(csv_path)
+    # Fast path: an untouched CSV needs no hashing at all
+    if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    return meta['size'] == stat.st_size and meta['sha256'] == file_sha256(csv_path)
+
+
+def prepare_frame(csv_path, compact=False):
+    """Parse a CSV into the cached layout; returns (frame, memory report or None)."""
+    # Rows are stored in (Year, Month) order so year ranges are contiguous
+    df = sort_by_time(add_derived_features(pd.read_csv(csv_path)))
+    if not compact:
+        return df, None
+    compacted = compact_frame(df)
+    return compacted, memory_report(df, compacted)
+
+
+def write_frame(df, path, meta):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        META_KEY: json.dumps(meta).encode(),
+    })
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Write to a private file and rename so concurrent readers never see a partial cache
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def source_meta(csv_path, compact=False):
+    stat = os.stat(csv_path)
+    return {
+        'format': CACHE_FORMAT,
+        'compact': compact,
+        'source': os.path.abspath(csv_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(csv_path),
+    }
+
+
+def build_cache(csv_path=DATA_PATH, cache_path=None, compact=False):
+    cache_path = cache_path or cache_path_for(csv_path, compact)
+    meta = source_meta(csv_path, compact)
+    df, memory = prepare_frame(csv_path, compact)
+    if memory:
+        meta['memory'] = memory
+    return write_frame(df, cache_path, meta)
+
+
+def read_cache(cache_path):
+    with pa.memory_map(cache_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def load_imports(csv_path=DATA_PATH, cache_path=None, compact=COMPACT_SCHEMA):
+    """Load the imports frame with derived features, rebuilding the cache if stale."""
+    cache_path = cache_path or cache_path_for(csv_path, compact)
+    if not is_fresh(csv_path, cache_path, compact):
+        build_cache(csv_path, cache_path, compact)
+    return read_cache(cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar imports cache.")
+    parser.add_argument('csv_path', nargs='?', default=DATA_PATH)
+    parser.add_argument('--cache-path', default=None)
+    parser.add_argument('--compact', action='store_true', default=COMPACT_SCHEMA,
+                        help="Store the compact schema (categoricals, small ints, float32 ratios)")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the cache is fresh")
+    args = parser.parse_args()
+
+    cache_path = args.cache_path or cache_path_for(args.csv_path, args.compact)
+    if args.force or not is_fresh(args.csv_path, cache_path, args.compact):
+        build_cache(args.csv_path, cache_path, args.compact)
+        print(f"Built {cache_path}")
+    else:
+        print(f"{cache_path} is up to date")
+
+    memory = (read_metadata(cache_path) or {}).get('memory')
+    if memory:
+        print(f"Memory: {memory['before_bytes'] / 2**20:,.1f} MB -> "
+              f"{memory['after_bytes'] / 2**20:,.1f} MB ({memory['ratio']:.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""Array-backed compiled form of the random-forest price predictor.
+
+All trees are flattened into one set of contiguous node arrays (feature,
+threshold, first child, leaf value). Nodes are renumbered breadth-first so
+the two children of a split are adjacent and the step is simply
+``left[node] + (x > threshold)``. Leaves point to themselves, so a batch is
+predicted by stepping every (row, tree) pair down one level at a time for
+``max_depth`` vectorized steps, with no Python loop over trees.
+
+The compiled artifact is a directory of ``.npy`` files that are memory-mapped
+on load, plus the fitted preprocessor and a small ``meta.json``:
+
+    python -m utils.compiled_forest [--float32] [--dedupe-leaves] [--verify 1000]
+"""
+import argparse
+import json
+import os
+import weakref
+
+import numpy as np
+
+from utils.config import COMPILED_MODEL_PATH, DATA_PATH, MODEL_PATH
+
+ARRAYS = ['roots', 'feature', 'threshold', 'left', 'value', 'value_index']
+
+# Rows per traversal block; bounds the (rows x trees) node-index scratch space
+BLOCK_ROWS = 1024
+
+
+def _round_down_float32(values):
+    # sklearn compares float32 inputs against float64 thresholds; rounding each
+    # threshold down to the nearest float32 keeps every comparison identical
+    narrowed = values.astype('float32')
+    over = narrowed.astype('float64') > values
+    narrowed[over] = np.nextafter(narrowed[over], np.float32(-np.inf))
+    return narrowed
+
+
+class CompiledForest:
+    def __init__(self, roots, feature, threshold, left, value,
+                 value_index=None, n_features_in_=None, max_depth=None):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.value = value
+        self.value_index = value_index
+        self.n_features_in_ = n_features_in_
+        self.max_depth = max_depth
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAYS if getattr(self, name) is not None)
+
+    # ---- INFERENCE ----
+    def apply(self, X):
+        """Global leaf index reached by every row in every tree, shape (rows, trees)."""
+        X = _as_float32(X)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        node = np.empty((n_rows, self.n_trees), dtype=self.left.dtype)
+        node[:] = self.roots
+        row_offset = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        for _ in range(self.max_depth):
+            go_right = flat[row_offset + self.feature[node]] > self.threshold[node]
+            node = self.left[node] + go_right
+        return node
+
+    def leaf_values(self, node):
+        if self.value_index is None:
+            return self.value[node]
+        return self.value[self.value_index[node]]
+
+    def predict_per_tree(self, X):
+        # Sparse inputs are densified one block at a time
+        out = np.empty((X.shape[0], self.n_trees), dtype='float64')
+        for start in range(0, X.shape[0], BLOCK_ROWS):
+            out[start:start + BLOCK_ROWS] = self.leaf_values(self.apply(X[start:start + BLOCK_ROWS]))
+        return out
+
+    def predict(self, X):
+        out = np.empty(X.shape[0], dtype='float64')
+        for start in range(0, X.shape[0], BLOCK_ROWS):
+            leaves = self.leaf_values(self.apply(X[start:start + BLOCK_ROWS]))
+            out[start:start + BLOCK_ROWS] = leaves.mean(axis=1, dtype='float64')
+        return out
+
+    def predict_interval(self, X, coverage=0.8):
+        """(point, lower, upper) from one traversal: the mean over trees and
+        the central ``coverage`` range of the per-tree predictions."""
+        quantiles = [(1 - coverage) / 2, (1 + coverage) / 2]
+        point = np.empty(X.shape[0], dtype='float64')
+        bounds = np.empty((2, X.shape[0]), dtype='float64')
+        for start in range(0, X.shape[0], BLOCK_ROWS):
+            leaves = self.leaf_values(self.apply(X[start:start + BLOCK_ROWS]))
+            point[start:start + BLOCK_ROWS] = leaves.mean(axis=1, dtype='float64')
+            bounds[:, start:start + BLOCK_ROWS] = np.quantile(leaves, quantiles, axis=1)
+        return point, bounds[0], bounds[1]
+
+    # ---- PERSISTENCE ----
+    def save(self, path, **extra_meta):
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            array = getattr(self, name)
+            if array is not None:
+                np.save(os.path.join(path, f'{name}.npy'), array)
+        meta = {
+            'n_trees': self.n_trees,
+            'n_features_in_': self.n_features_in_,
+            'max_depth': self.max_depth,
+            'nbytes': self.nbytes,
+            **extra_meta,
+        }
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {}
+        for name in ARRAYS:
+            array_path = os.path.join(path, f'{name}.npy')
+            arrays[name] = np.load(array_path, mmap_mode=mmap_mode) if os.path.exists(array_path) else None
+        return cls(**arrays, n_features_in_=meta['n_features_in_'], max_depth=meta['max_depth'])
+
+
+def _as_float32(X):
+    if hasattr(X, 'toarray'):
+        X = X.toarray()
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+# ---- COMPILATION ----
+def _breadth_first(children_left, children_right, max_depth=None):
+    """Node order in which every split's two children are adjacent.
+
+    Splits below ``max_depth`` are not followed, so the order stops there.
+    """
+    levels = [np.array([0])]
+    frontier = levels[0]
+    while max_depth is None or len(levels) <= max_depth:
+        internal = frontier[children_left[frontier] != -1]
+        if not len(internal):
+            break
+        frontier = np.column_stack([children_left[internal], children_right[internal]]).ravel()
+        levels.append(frontier)
+    return np.concatenate(levels)
+
+
+def compile_forest(model, float32_thresholds=False, dedupe_leaves=False, n_trees=None, depth_cap=None):
+    """Flatten a fitted sklearn forest regressor into a CompiledForest.
+
+    ``n_trees`` keeps only the first trees and ``depth_cap`` turns every node
+    at that depth into a leaf predicting the mean of its training samples,
+    which sklearn stores on internal nodes too.
+    """
+    if not hasattr(model, 'estimators_'):
+        raise TypeError(f"Expected a fitted tree ensemble, got {type(model).__name__}")
+
+    trees = [est.tree_ for est in model.estimators_[:n_trees]]
+    if any(tree.n_outputs != 1 for tree in trees):
+        raise ValueError("Only single-output regressors can be compiled")
+
+    orders = [_breadth_first(tree.children_left, tree.children_right, depth_cap) for tree in trees]
+    sizes = np.array([len(order) for order in orders])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    n_nodes = int(sizes.sum())
+    index_dtype = np.int32 if n_nodes < np.iinfo(np.int32).max else np.int64
+    feature_dtype = np.int16 if model.n_features_in_ < np.iinfo(np.int16).max else np.int32
+
+    feature = np.empty(n_nodes, dtype=feature_dtype)
+    threshold = np.empty(n_nodes, dtype='float64')
+    left = np.empty(n_nodes, dtype=index_dtype)
+    value = np.empty(n_nodes, dtype='float64')
+
+    for tree, order, offset, size in zip(trees, orders, offsets, sizes):
+        # -1 marks nodes cut off by depth_cap; index node_count stands for "no child"
+        new_index = np.full(tree.node_count + 1, -1, dtype=np.int64)
+        new_index[order] = np.arange(size)
+
+        span = slice(offset, offset + size)
+        children = tree.children_left[order]
+        is_leaf = new_index[np.where(children == -1, tree.node_count, children)] == -1
+        # Leaves loop back onto themselves and never test x > +inf
+        feature[span] = np.where(is_leaf, 0, tree.feature[order])
+        threshold[span] = np.where(is_leaf, np.inf, tree.threshold[order])
+        left[span] = offset + np.where(is_leaf, np.arange(size), new_index[children])
+        value[span] = tree.value[order, 0, 0]
+
+    if float32_thresholds:
+        threshold = _round_down_float32(threshold)
+
+    value_index = None
+    if dedupe_leaves:
+        value, value_index = np.unique(value, return_inverse=True)
+        value_index = value_index.astype(index_dtype)
+
+    return CompiledForest(
+        roots=offsets.astype(index_dtype),
+        feature=feature,
+        threshold=threshold,
+        left=left,
+        value=value,
+        value_index=value_index,
+        n_features_in_=int(model.n_features_in_),
+        max_depth=int(max(tree.max_depth for tree in trees) if depth_cap is None
+                      else min(depth_cap, max(tree.max_depth for tree in trees))),
+    )
+
+
+def _source_fingerprint(artifact_path):
+    stat = os.stat(artifact_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def export_compiled(artifact_path=MODEL_PATH, out_path=COMPILED_MODEL_PATH,
+                    float32_thresholds=False, dedupe_leaves=False):
+    import joblib
+    artifact = joblib.load(artifact_path)
+    compiled = compile_forest(artifact['model'], float32_thresholds, dedupe_leaves)
+    compiled.save(out_path, source=_source_fingerprint(artifact_path))
+    joblib.dump(artifact['preprocessor'], os.path.join(out_path, 'preprocessor.pkl'))
+    return artifact, compiled
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(path=COMPILED_MODEL_PATH, artifact_path=MODEL_PATH, tier='full', full_path=COMPILED_MODEL_PATH):
+    """True if the compiled forest at ``path`` is ``tier`` and was built from the current pickle.
+
+    Deployments may ship only compiled artifacts. Without the pickle the full
+    forest is trusted, and a reduced tier only if it was built from the same
+    pickle as the full forest at ``full_path``.
+    """
+    meta = _read_meta(path)
+    if meta is None or meta.get('tier', 'full') != tier:
+        return False
+    if os.path.exists(artifact_path):
+        return meta.get('source') == _source_fingerprint(artifact_path)
+    if tier == 'full':
+        return True
+    full = _read_meta(full_path)
+    return (full is not None and full.get('tier', 'full') == 'full'
+            and meta.get('source') is not None and meta.get('source') == full.get('source'))
+
+
+def load_compiled(path=COMPILED_MODEL_PATH):
+    """Memory-map a compiled forest and its preprocessor."""
+    import joblib
+    return CompiledForest.load(path), joblib.load(os.path.join(path, 'preprocessor.pkl'))
+
+
+# sklearn forests compiled for predict_interval, kept for the model's lifetime
+_compiled_models = weakref.WeakKeyDictionary()
+
+
+def predict_interval(model, X, coverage=0.8):
+    """(point, lower, upper) for a CompiledForest or a fitted sklearn forest.
+
+    An sklearn forest is compiled on first use, so no call loops over
+    ``estimators_`` in Python.
+    """
+    if not isinstance(model, CompiledForest):
+        compiled = _compiled_models.get(model)
+        if compiled is None:
+            compiled = _compiled_models[model] = compile_forest(model)
+        model = compiled
+    return model.predict_interval(X, coverage)
+
+
+def max_abs_error(compiled, model, X):
+    return float(np.max(np.abs(compiled.predict(X) - model.predict(X)), initial=0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the price predictor into flat arrays.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--out', default=COMPILED_MODEL_PATH)
+    parser.add_argument('--float32', action='store_true', help="Store thresholds as float32")
+    parser.add_argument('--dedupe-leaves', action='store_true', help="Store each distinct leaf value once")
+    parser.add_argument('--verify', type=int, default=0, metavar='N',
+                        help="Compare against model.predict on N rows of the training data")
+    parser.add_argument('--tolerance', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    artifact, compiled = export_compiled(args.model_path, args.out, args.float32, args.dedupe_leaves)
+    print(f"Compiled {compiled.n_trees} trees ({len(compiled.feature):,} nodes, "
+          f"{compiled.nbytes / 2**20:,.1f} MB) to {args.out}")
+
+    if args.verify:
+        from utils.columnar_cache import load_imports
+        from utils.features import build_features
+
+        preprocessor = artifact['preprocessor']
+        sample = load_imports(DATA_PATH).sample(args.verify, random_state=0, replace=True)
+        X = preprocessor.transform(build_features(sample, preprocessor.feature_names_in_))
+        error = max_abs_error(compiled, artifact['model'], X)
+        # Leaf means are averaged in a different order, so allow relative rounding noise
+        scale = max(float(np.abs(artifact['model'].predict(X)).max(initial=1.0)), 1.0)
+        status = "OK" if error <= args.tolerance * scale else "MISMATCH"
+        print(f"Verification on {args.verify} rows: max abs error {error:.3g} ({status})")
+        if status != "OK":
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
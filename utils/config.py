@@ -0,0 +1,68 @@
+import os
+from dotenv import load_dotenv
+
+# Settings can be overridden from the environment or a local .env file
+load_dotenv()
+
+
+def env_flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+DATA_PATH = os.getenv('UG_DATA_PATH', 'data/Uganda_imports_train.csv')
+CACHE_DIR = os.getenv('UG_CACHE_DIR', 'data/cache')
+# Monthly declaration batches picked up by `python -m utils.ingest`
+PARTITION_DIR = os.getenv('UG_PARTITION_DIR', 'data/partitions')
+MODEL_PATH = os.getenv('UG_MODEL_PATH', 'models/best_price_predictor.pkl')
+# Model tier served by load_model: 'full', or 'balanced'/'fast' built by `python -m utils.model_tiers`
+MODEL_TIER = os.getenv('UG_MODEL_TIER', 'full')
+# Versioned artifacts written by `python -m utils.train`
+MODEL_VERSIONS_DIR = os.getenv('UG_MODEL_VERSIONS_DIR', 'models/versions')
+# Flattened forest written by `python -m utils.compiled_forest`; used when present
+COMPILED_MODEL_PATH = os.getenv('UG_COMPILED_MODEL_PATH', 'models/best_price_predictor.forest')
+
+# Categoricals, small ints and float32 ratios for the cached frame (utils.schema)
+COMPACT_SCHEMA = env_flag('UG_COMPACT_SCHEMA')
+
+# Out-of-core mode (utils.streaming): aggregate the CSV chunk by chunk and keep
+# only the cube plus a uniform sample of rows in memory
+STREAMING_MODE = env_flag('UG_STREAMING')
+STREAM_CHUNK_ROWS = int(os.getenv('UG_STREAM_CHUNK_ROWS', '200000'))
+STREAM_SAMPLE_ROWS = int(os.getenv('UG_STREAM_SAMPLE_ROWS', '200000'))
+
+# Snapshot directory written by `python -m utils.shared_store publish`; when
+# set, workers memory-map the published dataset and model instead of loading
+SHARED_DIR = os.getenv('UG_SHARED_DIR', '')
+
+# Valuation screening job (utils.screening); 0 workers means one per core
+SCREENING_DIR = os.getenv('UG_SCREENING_DIR', 'data/screening')
+SCREENING_WORKERS = int(os.getenv('UG_SCREENING_WORKERS', '0'))
+SCREENING_PARTITION_ROWS = int(os.getenv('UG_SCREENING_PARTITION_ROWS', '100000'))
+SCREENING_Z = float(os.getenv('UG_SCREENING_Z', '3.0'))
+
+# Share of per-tree predictions covered by the shown price range; 0 turns ranges off
+INTERVAL_COVERAGE = float(os.getenv('UG_INTERVAL_COVERAGE', '0.8'))
+
+# Prediction cache (utils.prediction_cache); set a path to share entries across processes
+PREDICTION_CACHE_SIZE = int(os.getenv('UG_PREDICTION_CACHE_SIZE', '1024'))
+PREDICTION_CACHE_TTL = float(os.getenv('UG_PREDICTION_CACHE_TTL', '3600'))
+PREDICTION_CACHE_PATH = os.getenv('UG_PREDICTION_CACHE_PATH', '')
+
+# Rendered-figure cache (utils.figure_cache); set a path to keep figures across restarts
+FIGURE_CACHE_MB = float(os.getenv('UG_FIGURE_CACHE_MB', '64'))
+FIGURE_CACHE_PATH = os.getenv('UG_FIGURE_CACHE_PATH', '')
+
+# Chart payload limits (utils.downsample)
+CHART_POINT_BUDGET = int(os.getenv('UG_CHART_POINT_BUDGET', '5000'))
+WEBGL_THRESHOLD = int(os.getenv('UG_WEBGL_THRESHOLD', '1000'))
+
+# Timing spans (utils.telemetry); off by default and close to free while off
+METRICS_ENABLED = env_flag('UG_METRICS')
+METRICS_LOG = env_flag('UG_METRICS_LOG')
+METRICS_PORT = int(os.getenv('UG_METRICS_PORT', '0'))
+METRICS_HISTORY = int(os.getenv('UG_METRICS_HISTORY', '500'))
+# Show the hidden Performance page in the navigation
+PERFORMANCE_PAGE = env_flag('UG_PERFORMANCE_PAGE')
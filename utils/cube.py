@@ -0,0 +1,84 @@
+"""Pre-aggregated cube backing the Analytical Reports page.
+
+Raw declarations are rolled up once per (Year, Month, Country, Item,
+Transport, HS Code) cell. Every measure is additive (sums and non-null
+counts), so any coarser report is a cheap groupby over the cube and means are
+recovered as sum / count. The same additivity lets new batches be merged
+into an existing cube (merge_cubes). The cube is kept sorted by (Year, Month)
+so a year range is a contiguous slice.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.schema import concat_frames
+
+CUBE_KEYS = [
+    'Year', 'Month', 'Country_of_Origin', 'Item_Description',
+    'Mode_of_Transport', 'HS_Code'
+]
+
+# Stored as <col>_sum and <col>_count
+MEASURES = ['CIF_Value_USD', 'Tax_Load', 'Freight_USD', 'Unit_Price_UGX', 'Import_Duration', 'Value_Density']
+
+# Stored as <col>_wsum = sum(col * weight), for value-weighted chart colours
+WEIGHTED_MEASURES = {
+    'Value_Density': 'CIF_Value_USD',
+    'Freight_USD': 'CIF_Value_USD',
+}
+
+
+def build_cube(df):
+    cells = pd.DataFrame({key: df[key] for key in CUBE_KEYS})
+    cells['Rows'] = 1
+    for col in MEASURES:
+        cells[f'{col}_sum'] = df[col]
+        cells[f'{col}_count'] = df[col].notna().astype('int64')
+    for col, weight in WEIGHTED_MEASURES.items():
+        cells[f'{col}_wsum'] = df[col] * df[weight]
+
+    cube = cells.groupby(CUBE_KEYS, observed=True, dropna=False, sort=True).sum()
+    return cube.reset_index()
+
+
+def merge_cubes(cube, delta, sign=1):
+    """Add the cells of ``delta`` to ``cube``, or remove them with sign=-1.
+
+    Costs time in the size of the two cubes, not of the rows behind them.
+    """
+    measures = measure_columns(delta)
+    delta = delta.assign(**{col: delta[col] * sign for col in measures})
+    return combine_cubes([cube, delta])
+
+
+def combine_cubes(cubes):
+    """Sum any number of cubes cell by cell, in a single groupby."""
+    merged = concat_frames(list(cubes)).groupby(CUBE_KEYS, observed=True, dropna=False, sort=True).sum()
+    return merged[merged['Rows'] != 0].reset_index()
+
+
+def slice_years(cube, start, end):
+    """Rows of the cube for start <= Year <= end, as a positional slice."""
+    years = cube['Year'].to_numpy()
+    lo = np.searchsorted(years, start, side='left')
+    hi = np.searchsorted(years, end, side='right')
+    return cube.iloc[lo:hi]
+
+
+def measure_columns(cube):
+    return [col for col in cube.columns if col not in CUBE_KEYS]
+
+
+def rollup(cube, by):
+    return cube.groupby(by, observed=True)[measure_columns(cube)].sum()
+
+
+def total(agg, col):
+    return agg[f'{col}_sum']
+
+
+def mean(agg, col):
+    return agg[f'{col}_sum'] / agg[f'{col}_count']
+
+
+def weighted_mean(agg, col):
+    return agg[f'{col}_wsum'] / agg[f'{WEIGHTED_MEASURES[col]}_sum']
@@ -1,30 +1,214 @@
-import pandas as pd
-import joblib
+import hashlib
 import streamlit as st
 import os
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import (COMPACT_SCHEMA, COMPILED_MODEL_PATH, DATA_PATH, FIGURE_CACHE_MB,
+                          FIGURE_CACHE_PATH, MODEL_PATH, MODEL_TIER, PREDICTION_CACHE_PATH, SCREENING_DIR,
+                          PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL, SHARED_DIR, STREAMING_MODE)
+from utils.cube import build_cube
+from utils.figure_cache import FigureCache
+from utils.ingest import data_version, load_dataset, load_ingested_cube
+from utils.prediction_cache import PredictionCache
+from utils.row_index import RowIndex
+from utils.streaming import stream_summary
+from utils.telemetry import timed
+
+# scikit-learn, joblib and the model artifacts are imported on first use, so
+# pages that never predict (and the first paint of those that do) skip them
 
 # ---- DATA LOADING ----
-@st.cache_data
+# Cached entries are keyed on the ingestion manifest, so a nightly
+# `python -m utils.ingest` is picked up without restarting the app.
+# In streaming mode the full frame is never built: aggregates come from the
+# streamed cube and row-level views get a bounded uniform sample.
+# With UG_SHARED_DIR set, every worker maps the same published snapshot.
+def _shared_snapshot():
+    if not SHARED_DIR:
+        return None
+    from utils.shared_store import published_version, schema_compact
+    version = published_version(SHARED_DIR)
+    snapshot = _attach_snapshot(version) if version else None
+    # Another schema would change dtypes and precision; load locally instead
+    if snapshot is not None and schema_compact(snapshot.meta) != COMPACT_SCHEMA:
+        return None
+    return snapshot
+
+@st.cache_resource(max_entries=1)
+@timed('snapshot.attach')
+def _attach_snapshot(version):
+    from utils.shared_store import Snapshot
+    snapshot = Snapshot(SHARED_DIR, version)
+    if snapshot.model is not None:
+        _model_versions[snapshot.model] = f'shared-{version}'
+    return snapshot
+
+@timed('data.load')
 def load_data():
-    df = pd.read_csv('data/Uganda_imports_train.csv')
-    df['Value_Density'] = df['CIF_Value_USD'] / (df['Gross_Mass_kg'] + 1e-6)
-    df['Tax_Load'] = df['Tax_Rate'] * df['CIF_Value_USD']
-    df['Import_Duration'] = df['Year'] + df['Month'] / 12
-    df['FOB_per_kg'] = df['FOB_Value_USD'] / (df['Gross_Mass_kg'] + 1e-6)
-    df['Freight_per_kg'] = df['Freight_USD'] / (df['Gross_Mass_kg'] + 1e-6)
-    df['Insurance_per_kg'] = df['Insurance_USD'] / (df['Gross_Mass_kg'] + 1e-6)
-    return df
+    """The shared imports frame; treat it as read-only."""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        # Read-only memory-mapped columns; callers must not modify them in place
+        return snapshot.frame
+    if STREAMING_MODE:
+        return _load_stream(data_version())[1]
+    # The same cached frame as load_indexed_data, not a per-call copy
+    return _load_indexed_data(data_version())[0]
+
+@timed('data.load_indexed')
+def load_indexed_data():
+    """Shared (frame, RowIndex) for filtered views; treat the frame as read-only."""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        return snapshot.frame, snapshot.index
+    if STREAMING_MODE:
+        _, sample, index = _load_stream(data_version())
+        return sample, index
+    return _load_indexed_data(data_version())
+
+@st.cache_resource(max_entries=1)
+@timed('data.index')
+def _load_indexed_data(version):
+    # Derived features are precomputed in the memory-mapped columnar caches
+    df = load_dataset(DATA_PATH)
+    return df, RowIndex(df)
+
+@timed('cube.load')
+def load_cube():
+    """The shared report cube; treat it as read-only."""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        return snapshot.cube
+    if STREAMING_MODE:
+        return _load_stream(data_version())[0]
+    return _load_cube(data_version())
+
+@st.cache_resource(max_entries=1)
+@timed('cube.build')
+def _load_cube(version):
+    # A resource, not cache_data: reruns share it instead of unpickling a copy
+    cube = load_ingested_cube(DATA_PATH)
+    return cube if cube is not None else build_cube(_load_indexed_data(version)[0])
+
+@st.cache_resource(max_entries=1)
+@timed('data.stream')
+def _load_stream(version):
+    summary = stream_summary(DATA_PATH)
+    sample = summary.sample()
+    return summary.cube, sample, RowIndex(sample)
+
+def dataset_version():
+    """Identifies the data behind every view, across restarts; keys cached figures."""
+    snapshot = _shared_snapshot()
+    if snapshot is not None:
+        return f'shared-{snapshot.version}'
+    stat = os.stat(DATA_PATH)
+    mode = 'stream' if STREAMING_MODE else 'memory'
+    return f'{mode}-{stat.st_size}-{stat.st_mtime_ns}-{data_version()}'
 
 @st.cache_resource
-def load_model():
-    model_path = 'models/best_price_predictor.pkl'
+def load_figure_cache():
+    return FigureCache(int(FIGURE_CACHE_MB * 2**20), FIGURE_CACHE_PATH or None)
+
+def load_screening():
+    """(summary, flagged rows) of the last `python -m utils.screening` run, or None."""
+    from utils.screening import current_run
+    run_dir = current_run(SCREENING_DIR)
+    summary_path = os.path.join(run_dir, 'summary.json') if run_dir else None
+    if summary_path is None or not os.path.exists(summary_path):
+        return None
+    return _load_screening(run_dir, os.stat(summary_path).st_mtime_ns)
+
+@st.cache_data(max_entries=1)
+def _load_screening(run_dir, version):
+    from utils.screening import read_flagged, read_summary
+    return read_summary(run_dir), read_flagged(run_dir)
+
+# Fingerprint of the artifact each loaded model came from, for cache invalidation
+_model_versions = weakref.WeakKeyDictionary()
+
+def _artifact_version(path):
+    """Hash of the artifact's content, so copies and touched files keep their version.
+
+    A compiled forest directory is hashed file by file, leaving out
+    meta.json, which records the source pickle's mtime.
+    """
+    if os.path.isdir(path):
+        files = [(name, os.path.join(path, name)) for name in sorted(os.listdir(path)) if name != 'meta.json']
+    else:
+        files = [('', path)]
+    digest = hashlib.sha256()
+    for name, file_path in files:
+        digest.update(name.encode())
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+def model_version(model):
+    return _model_versions.get(model)
+
+@timed('model.read')
+def read_model(model_path=MODEL_PATH, compiled_path=COMPILED_MODEL_PATH, tier=MODEL_TIER):
+    """Load (model, preprocessor) without Streamlit; None, None if missing.
+
+    ``tier`` 'fast' or 'balanced' serves a reduced forest from
+    utils.model_tiers; the full model is used until that tier is built.
+    Any other tier raises ValueError.
+    """
+    import joblib
+    from utils.compiled_forest import is_current, load_compiled
+    from utils.model_tiers import TIERS, tier_path
+    if tier not in TIERS:
+        raise ValueError(f"Unknown model tier {tier!r} (UG_MODEL_TIER); expected one of {', '.join(TIERS)}")
+    if tier != 'full':
+        path = tier_path(tier, compiled_path)
+        if is_current(path, model_path, tier, compiled_path):
+            model, preprocessor = load_compiled(path)
+            _model_versions[model] = _artifact_version(path)
+            return model, preprocessor
+    # Prefer the memory-mapped compiled forest when it matches the pickle
+    if is_current(compiled_path, model_path):
+        model, preprocessor = load_compiled(compiled_path)
+        _model_versions[model] = _artifact_version(compiled_path)
+        return model, preprocessor
     if not os.path.exists(model_path):
-        st.error("Model file not found. Please ensure it exists under /models.")
         return None, None
-    model = joblib.load(model_path)
-    return model['model'], model['preprocessor']
+    artifact = joblib.load(model_path)
+    _model_versions[artifact['model']] = _artifact_version(model_path)
+    return artifact['model'], artifact['preprocessor']
+
+@st.cache_resource
+def _model_future():
+    # One background load per process; the executor exits once it is done
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-loader')
+    future = executor.submit(read_model)
+    executor.shutdown(wait=False)
+    return future
+
+def warm_model():
+    """Start loading the model in the background and return immediately."""
+    if _shared_snapshot() is None:
+        _model_future()
+
+@timed('model.load')
+def load_model():
+    snapshot = _shared_snapshot()
+    if snapshot is not None and snapshot.model is not None:
+        return snapshot.model, snapshot.preprocessor
+    # Usually already finished, since the dashboard started it
+    future = _model_future()
+    if future.exception() is not None:
+        # Do not keep a failed load; the next rerun tries again
+        _model_future.clear()
+    model, preprocessor = future.result()
+    if model is None:
+        st.error("Model file not found. Please ensure it exists under /models.")
+    return model, preprocessor
+
+@st.cache_resource
+def load_prediction_cache():
+    return PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL, PREDICTION_CACHE_PATH or None)
 
 # Columns for preprocessing
 TARGET = 'Unit_Price_UGX'
@@ -48,9 +232,47 @@ categorical_features = [
     'Valuation_Method', 'Item_Description'
 ]
 
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', StandardScaler(), numeric_features),
-        ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False), categorical_features)
-    ]
-)
+# Categorical encoding modes; 'onehot' is the dense encoding the shipped model uses
+ENCODINGS = ['onehot', 'sparse', 'ordinal', 'target', 'hashing']
+HASH_FEATURES = 2 ** 12
+
+def _hash_tokens(X):
+    # One "column=value" token per categorical field, for FeatureHasher
+    tokens = [col + '=' + X[col].astype(str) for col in X.columns]
+    return list(zip(*tokens))
+
+def make_categorical_encoder(encoding='onehot'):
+    from sklearn.feature_extraction import FeatureHasher
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder, TargetEncoder
+    if encoding == 'onehot':
+        return OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+    if encoding == 'sparse':
+        return OneHotEncoder(handle_unknown='ignore', sparse_output=True)
+    if encoding == 'ordinal':
+        return OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    if encoding == 'target':
+        return TargetEncoder(target_type='continuous', random_state=42)
+    if encoding == 'hashing':
+        return make_pipeline(
+            FunctionTransformer(_hash_tokens),
+            FeatureHasher(n_features=HASH_FEATURES, input_type='string')
+        )
+    raise ValueError(f"Unknown encoding {encoding!r}; expected one of {ENCODINGS}")
+
+def make_preprocessor(encoding='onehot'):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import StandardScaler
+    return ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numeric_features),
+            ('cat', make_categorical_encoder(encoding), categorical_features)
+        ]
+    )
+
+def __getattr__(name):
+    # The unfitted default preprocessor is built on first access, not at import
+    if name == 'preprocessor':
+        globals()['preprocessor'] = make_preprocessor()
+        return globals()['preprocessor']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
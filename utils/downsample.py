@@ -0,0 +1,116 @@
+"""Server-side reduction of chart data before it is sent to the browser.
+
+- Trends are aggregated per time bucket, and long series are decimated with
+  largest-triangle-three-buckets (LTTB).
+- Scatters keep a density-stratified sample: rows fall into a grid of
+  quantile cells and each cell keeps at most a shared quota, so sparse
+  regions and outliers survive while dense clouds thin out.
+- Histograms are binned with NumPy and drawn as bars.
+
+Charts above WEBGL_THRESHOLD points should use WebGL traces (render_mode).
+"""
+import numpy as np
+import pandas as pd
+
+from utils.config import CHART_POINT_BUDGET, WEBGL_THRESHOLD
+
+
+def render_mode(n_points):
+    return 'webgl' if n_points > WEBGL_THRESHOLD else 'svg'
+
+
+def lttb_indices(x, y, n_out):
+    """Row positions kept by largest-triangle-three-buckets on sorted x."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket is the third triangle vertex
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def time_buckets(df, x, y, agg='sum', max_points=CHART_POINT_BUDGET):
+    """Aggregate y per distinct x, sorted; decimate with LTTB beyond the budget."""
+    series = df.groupby(x, observed=True, sort=True)[y].agg(agg).reset_index()
+    if len(series) > max_points:
+        series = series.iloc[lttb_indices(series[x].to_numpy(), series[y].to_numpy(), max_points)]
+    return series
+
+
+def _quantile_cells(values, bins):
+    values = np.asarray(values, dtype='float64')
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return np.zeros(len(values), dtype=np.int64)
+    edges = np.unique(np.quantile(finite, np.linspace(0, 1, bins + 1)))
+    return np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max(len(edges) - 2, 0))
+
+
+def _cell_quota(counts, budget):
+    """Largest per-cell cap q with sum(min(count, q)) <= budget."""
+    lo, hi = 1, int(counts.max())
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if np.minimum(counts, mid).sum() <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _grid_cells(df, x, y, by, bins):
+    cells = _quantile_cells(df[x], bins) * bins + _quantile_cells(df[y], bins)
+    if by is not None:
+        codes = pd.factorize(df[by])[0].astype(np.int64)
+        cells = codes * bins * bins + cells
+    return cells
+
+
+def downsample_scatter(df, x, y, max_points=CHART_POINT_BUDGET, by=None, bins=64, seed=0):
+    """Density-stratified sample of at most max_points rows.
+
+    With ``by`` the grid is kept per group, so every colour keeps its shape.
+    The grid is coarsened until the occupied cells fit in the budget.
+    """
+    if len(df) <= max_points:
+        return df
+    while True:
+        cells = _grid_cells(df, x, y, by, bins)
+        # Random rank of each row within its cell
+        order = np.random.default_rng(seed).permutation(len(df))
+        _, inverse, counts = np.unique(cells[order], return_inverse=True, return_counts=True)
+        if len(counts) <= max_points or bins == 1:
+            break
+        bins //= 2
+
+    sorted_rows = np.argsort(inverse, kind='stable')
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[sorted_rows] = np.arange(len(df)) - np.repeat(starts, counts)
+
+    quota = _cell_quota(counts, max_points)
+    keep = np.sort(order[rank < quota])
+    return df.iloc[keep]
+
+
+def histogram_bins(values, nbins=50):
+    """Bin centres, widths and counts, for drawing a histogram as bars."""
+    values = np.asarray(values, dtype='float64')
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=nbins)
+    return pd.DataFrame({
+        'bin': (edges[:-1] + edges[1:]) / 2,
+        'width': np.diff(edges),
+        'count': counts,
+    })
@@ -0,0 +1,123 @@
+"""Feature engineering shared by data loading, the prediction form, batch
+scoring and the prediction service.
+
+``build_features`` accepts a DataFrame or a mapping of column name to scalar
+or array, computes the derived features in one vectorized pass and assembles
+the model input directly in ``preprocessor.feature_names_in_`` order, so one
+row and a million rows take the same path and no reordering copy is needed.
+"""
+import numpy as np
+import pandas as pd
+
+# ---- DERIVED FEATURES ----
+# Small constant keeps the per-kg ratios finite for zero-mass declarations
+EPS = 1e-6
+
+DERIVED_FEATURES = [
+    'Value_Density', 'Tax_Load', 'Import_Duration',
+    'FOB_per_kg', 'Freight_per_kg', 'Insurance_per_kg'
+]
+
+# Raw fields the derived features are computed from
+DERIVED_INPUTS = [
+    'Gross_Mass_kg', 'FOB_Value_USD', 'Freight_USD', 'Insurance_USD',
+    'Tax_Rate', 'Year', 'Month'
+]
+
+CIF_PARTS = ['FOB_Value_USD', 'Freight_USD', 'Insurance_USD']
+
+# Fields the prediction form does not ask for
+PREDICTION_DEFAULTS = {
+    'Mode_of_Transport': 'AIR',
+    'Currency_Code': 'USD',
+    'Valuation_Method': 'CIF',
+}
+
+
+def _float(data, name):
+    values = data[name]
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    return np.asarray(values, dtype='float64')
+
+
+def _cif(data):
+    # Declared CIF when present, otherwise FOB + freight + insurance
+    if 'CIF_Value_USD' in data:
+        return _float(data, 'CIF_Value_USD')
+    fob, freight, insurance = (_float(data, name) for name in CIF_PARTS)
+    return fob + freight + insurance
+
+
+def derive(data):
+    """Derived feature arrays for a DataFrame or mapping of raw fields."""
+    mass = _float(data, 'Gross_Mass_kg') + EPS
+    cif = _cif(data)
+    return {
+        'Value_Density': cif / mass,
+        'Tax_Load': _float(data, 'Tax_Rate') * cif,
+        'Import_Duration': _float(data, 'Year') + _float(data, 'Month') / 12,
+        'FOB_per_kg': _float(data, 'FOB_Value_USD') / mass,
+        'Freight_per_kg': _float(data, 'Freight_USD') / mass,
+        'Insurance_per_kg': _float(data, 'Insurance_USD') / mass,
+    }
+
+
+def add_derived_features(df):
+    for name, values in derive(df).items():
+        df[name] = values
+    return df
+
+
+# ---- MODEL INPUTS ----
+def _n_rows(data):
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    return max((len(v) for v in data.values() if np.ndim(v) > 0), default=1)
+
+
+def _as_column(values, n_rows):
+    if isinstance(values, pd.Series):
+        return values.to_numpy()
+    values = np.asarray(values)
+    if values.ndim == 0:
+        dtype = values.dtype if values.dtype.kind in 'biuf' else object
+        return np.full(n_rows, values.item(), dtype=dtype)
+    return values
+
+
+def missing_inputs(data, feature_names, defaults=PREDICTION_DEFAULTS):
+    missing = [
+        name for name in feature_names
+        if name not in data and name not in DERIVED_FEATURES and name not in defaults
+        and not (name == 'CIF_Value_USD' and all(part in data for part in CIF_PARTS))
+    ]
+    if any(name in DERIVED_FEATURES for name in feature_names):
+        missing += [name for name in DERIVED_INPUTS if name not in data and name not in missing]
+    return missing
+
+
+def build_features(data, feature_names, defaults=PREDICTION_DEFAULTS):
+    """Model input frame with exactly ``feature_names``, in order.
+
+    ``data`` is a DataFrame or a mapping of field name to scalar or array;
+    scalars are broadcast. Columns are taken without copying where possible.
+    Raises ValueError naming every missing field.
+    """
+    missing = missing_inputs(data, feature_names, defaults)
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    n_rows = _n_rows(data)
+    derived = derive(data) if any(name in DERIVED_FEATURES for name in feature_names) else {}
+    columns = {}
+    for name in feature_names:
+        if name in derived:
+            columns[name] = _as_column(derived[name], n_rows)
+        elif name == 'CIF_Value_USD' and name not in data:
+            columns[name] = _as_column(_cif(data), n_rows)
+        elif name in data:
+            columns[name] = _as_column(data[name], n_rows)
+        else:
+            columns[name] = np.full(n_rows, defaults[name], dtype=object)
+    return pd.DataFrame(columns, copy=False)
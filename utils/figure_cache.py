@@ -0,0 +1,196 @@
+"""Cache of rendered Plotly figures, stored as the JSON sent to the browser.
+
+Figures are keyed on (page, view, filter parameters, dataset version). On a
+hit the stored JSON goes straight into Streamlit's chart message, so a repeat
+view skips both the pandas work behind the figure and its serialization.
+Entries are evicted least-recently-used once their total size exceeds
+``max_bytes``. An optional SQLite file keeps them across restarts and shares
+them between workers; it is trimmed to ``max_disk_bytes``.
+
+``warm_in_background`` builds a list of (key, builder) pairs on a daemon
+thread, so the default views are ready before anyone opens them.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.telemetry import span
+
+# Bump when chart code changes, so figures cached on disk are not reused
+FIGURE_FORMAT = 1
+
+
+def figure_key(page, view, params=(), version=None):
+    text = json.dumps([FIGURE_FORMAT, page, view, params, version], default=str, sort_keys=True)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def figure_json(fig):
+    # Same encoding st.plotly_chart uses, so a cached chart renders identically
+    import plotly.utils
+    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def show_figure(spec, use_container_width=False):
+    """Send serialized figure JSON to the current Streamlit container."""
+    import streamlit as st
+    try:
+        from streamlit.proto.PlotlyChart_pb2 import PlotlyChart
+        enqueue = st._main._enqueue
+    except (ImportError, AttributeError):
+        # Streamlit internals moved: fall back to a full re-serialization
+        import plotly.io
+        return st.plotly_chart(plotly.io.from_json(spec), use_container_width=use_container_width)
+    proto = PlotlyChart()
+    proto.use_container_width = use_container_width
+    proto.figure.spec = spec
+    proto.figure.config = json.dumps({'showLink': False, 'linkText': False})
+    proto.theme = 'streamlit'
+    return enqueue('plotly_chart', proto)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 2**20, disk_path=None, max_disk_bytes=512 * 2**20):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_disk(disk_path) if disk_path else None
+        self.hits = self.misses = self.evictions = self.disk_hits = self.warmed = 0
+
+    # ---- DISK TIER ----
+    @staticmethod
+    def _open_disk(path):
+        db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS figures (key TEXT PRIMARY KEY, spec TEXT, size INTEGER, used REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS figures_used ON figures (used)')
+        return db
+
+    def _disk_get(self, key, now):
+        row = self._db.execute('SELECT spec FROM figures WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute('UPDATE figures SET used = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def _disk_put(self, key, spec, now):
+        self._db.execute('INSERT OR REPLACE INTO figures VALUES (?, ?, ?, ?)', (key, spec, len(spec), now))
+        # Drop the least recently used figures beyond the byte budget
+        self._db.execute(
+            'DELETE FROM figures WHERE key IN (SELECT key FROM ('
+            'SELECT key, SUM(size) OVER (ORDER BY used DESC) AS running FROM figures'
+            ') WHERE running > ?)', (self.max_disk_bytes,)
+        )
+
+    # ---- PUBLIC API ----
+    def _lookup(self, key):
+        # (spec, from_disk); a disk hit is promoted to memory
+        spec = self._entries.get(key)
+        if spec is not None:
+            self._entries.move_to_end(key)
+            return spec, False
+        if self._db is not None:
+            spec = self._disk_get(key, time.time())
+            if spec is not None:
+                self._store(key, spec)
+                return spec, True
+        return None, False
+
+    def get(self, key):
+        with self._lock:
+            spec, from_disk = self._lookup(key)
+            if spec is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.disk_hits += from_disk
+            return spec
+
+    def put(self, key, spec):
+        with self._lock:
+            self._store(key, spec)
+            if self._db is not None:
+                self._disk_put(key, spec, time.time())
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key)[0] is not None
+
+    def _store(self, key, spec):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old)
+        self._entries[key] = spec
+        self.nbytes += len(spec)
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM figures')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'megabytes': self.nbytes / 2**20,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'disk_hits': self.disk_hits,
+            'warmed': self.warmed,
+        }
+
+    def spec(self, key, build):
+        """Cached JSON for ``key``, building the figure on a miss."""
+        spec = self.get(key)
+        if spec is None:
+            with span('figure.build'):
+                fig = build()
+            with span('figure.serialize'):
+                spec = figure_json(fig)
+            self.put(key, spec)
+        return spec
+
+
+def cached_chart(cache, key, build, use_container_width=False):
+    """Draw the figure ``build()`` would return, reusing cached JSON when possible."""
+    return show_figure(cache.spec(key, build), use_container_width)
+
+
+def warm_in_background(cache, views):
+    """Build every missing (key, builder) figure on a daemon thread.
+
+    ``views`` may be a callable returning the pairs, so that loading what
+    they need also happens off the calling thread.
+    """
+    def warm():
+        try:
+            pairs = views() if callable(views) else views
+        except Exception:
+            # Nothing to warm from (e.g. the dataset is missing); pages load on demand
+            return
+        for key, build in pairs:
+            if key in cache:
+                continue
+            try:
+                cache.put(key, figure_json(build()))
+                cache.warmed += 1
+            except Exception:
+                # Warming is best effort; the view is built on demand instead
+                continue
+
+    thread = threading.Thread(target=warm, name='figure-warmer', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,229 @@
+"""Incremental ingestion of monthly declaration batches.
+
+New declarations arrive as CSV files in PARTITION_DIR, one file per
+Year/Month by convention (``imports_2024_05.csv``). Each run of
+
+    python -m utils.ingest [--partition-dir DIR] [--compact]
+
+parses only the files that are new or whose content changed. It adds the
+derived features to those rows alone and stores each batch as its own Arrow
+partition next to the base cache. The new rows are merged into the persisted
+cube, and a JSON manifest records every ingested partition:
+- its source fingerprint,
+- its row count,
+- its (Year, Month) span.
+
+The nightly cost therefore follows the size of the new data, not the history.
+The base CSV is still handled by utils.columnar_cache. If it changes, the
+cube is rebuilt once from the full dataset. Ingested partitions are kept when
+their source file is later archived or deleted.
+
+The app reads the base cache, the manifest's partitions and the stored cube.
+The manifest's modification time serves as the data version, so Streamlit
+caches pick up an ingest without a restart.
+"""
+import argparse
+import glob
+import json
+import os
+from datetime import datetime, timezone
+
+import pyarrow as pa
+
+from utils.columnar_cache import (build_cache, cache_path_for, is_fresh, prepare_frame, read_cache,
+                                  read_metadata, source_meta, write_frame)
+from utils.config import CACHE_DIR, COMPACT_SCHEMA, DATA_PATH, PARTITION_DIR
+from utils.cube import build_cube, merge_cubes
+from utils.row_index import sort_by_time
+from utils.schema import concat_frames
+
+# Bump whenever the partition or cube layout changes; older manifests are rebuilt
+MANIFEST_FORMAT = 2
+
+
+# ---- PATHS ----
+def _stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def manifest_path_for(csv_path=DATA_PATH, compact=False, cache_dir=CACHE_DIR):
+    suffix = '.compact' if compact else ''
+    return os.path.join(cache_dir, f'{_stem(csv_path)}{suffix}.manifest.json')
+
+
+def cube_path_for(csv_path=DATA_PATH, compact=False, cache_dir=CACHE_DIR):
+    suffix = '.compact' if compact else ''
+    return os.path.join(cache_dir, f'{_stem(csv_path)}{suffix}.cube.arrow')
+
+
+def partition_cache_path(partition_path, compact=False, cache_dir=CACHE_DIR):
+    return cache_path_for(partition_path, compact, os.path.join(cache_dir, 'partitions'))
+
+
+# ---- MANIFEST ----
+def read_manifest(path):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == MANIFEST_FORMAT else None
+
+
+def write_manifest(manifest, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def data_version(csv_path=DATA_PATH, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """Changes whenever an ingest rewrites the manifest; None before the first one."""
+    try:
+        return os.stat(manifest_path_for(csv_path, compact, cache_dir)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _current_manifest(csv_path, compact, cache_dir):
+    # A manifest only describes the base it was built on
+    manifest = read_manifest(manifest_path_for(csv_path, compact, cache_dir))
+    meta = read_metadata(cache_path_for(csv_path, compact, cache_dir))
+    if manifest is None or meta is None or manifest['base']['sha256'] != meta['sha256']:
+        return None
+    return manifest
+
+
+def _column_names(cache_path):
+    with pa.memory_map(cache_path, 'r') as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+# ---- LOADING ----
+def _partition_caches(manifest):
+    partitions = sorted(manifest['partitions'].values(), key=lambda entry: entry['first']) if manifest else []
+    return [entry['cache'] for entry in partitions]
+
+
+def partition_caches(csv_path=DATA_PATH, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """Cache files of the ingested partitions, oldest first."""
+    return _partition_caches(_current_manifest(csv_path, compact, cache_dir))
+
+
+def _stack(base_cache, manifest):
+    frames = [read_cache(base_cache)] + [read_cache(path) for path in _partition_caches(manifest)]
+    # Partitions newer than the history keep the order; late batches get a stable re-sort
+    return sort_by_time(concat_frames(frames))
+
+
+def load_dataset(csv_path=DATA_PATH, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """Base history plus every ingested partition, sorted by (Year, Month)."""
+    base_cache = cache_path_for(csv_path, compact, cache_dir)
+    if not is_fresh(csv_path, base_cache, compact):
+        build_cache(csv_path, base_cache, compact)
+    return _stack(base_cache, _current_manifest(csv_path, compact, cache_dir))
+
+
+def load_ingested_cube(csv_path=DATA_PATH, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """The cube maintained by ingest, or None if there is no current one."""
+    if _current_manifest(csv_path, compact, cache_dir) is None:
+        return None
+    return read_cache(cube_path_for(csv_path, compact, cache_dir))
+
+
+# ---- INGESTION ----
+def _span(df):
+    keys = df['Year'].astype('int64') * 100 + df['Month'].astype('int64')
+    return (int(keys.min()), int(keys.max())) if len(keys) else (0, 0)
+
+
+def ingest(partition_dir=PARTITION_DIR, csv_path=DATA_PATH, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """Ingest new or changed partition files; returns a summary of the run."""
+    base_cache = cache_path_for(csv_path, compact, cache_dir)
+    if not is_fresh(csv_path, base_cache, compact):
+        build_cache(csv_path, base_cache, compact)
+    base_meta = read_metadata(base_cache)
+    columns = _column_names(base_cache)
+    cube_path = cube_path_for(csv_path, compact, cache_dir)
+
+    manifest = _current_manifest(csv_path, compact, cache_dir)
+    if manifest is not None and os.path.exists(cube_path):
+        cube, rebuilt = read_cache(cube_path), False
+    else:
+        # First run or a changed base: start the cube again from the full dataset
+        manifest = read_manifest(manifest_path_for(csv_path, compact, cache_dir)) or {'partitions': {}}
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'compact': compact,
+            'revision': manifest.get('revision', 0),
+            'base': {'source': base_meta['source'], 'sha256': base_meta['sha256']},
+            'partitions': manifest['partitions'],
+        }
+        cube, rebuilt = None, True
+
+    summary = {'added': [], 'replaced': [], 'unchanged': [], 'rows': 0, 'rebuilt_cube': rebuilt}
+    for path in sorted(glob.glob(os.path.join(partition_dir, '*.csv'))):
+        name = os.path.basename(path)
+        entry = manifest['partitions'].get(name)
+        stat = os.stat(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            summary['unchanged'].append(name)
+            continue
+        meta = source_meta(path, compact)
+        if entry and entry['sha256'] == meta['sha256']:
+            entry.update(size=meta['size'], mtime_ns=meta['mtime_ns'])
+            summary['unchanged'].append(name)
+            continue
+
+        df, _ = prepare_frame(path, compact)
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"{name} is missing columns: {', '.join(missing)}")
+        df = df[columns]
+
+        if entry and cube is not None:
+            cube = merge_cubes(cube, build_cube(read_cache(entry['cache'])), sign=-1)
+        cache = write_frame(df, partition_cache_path(path, compact, cache_dir), meta)
+        if cube is not None:
+            cube = merge_cubes(cube, build_cube(df))
+
+        first, last = _span(df)
+        manifest['partitions'][name] = {
+            **{key: meta[key] for key in ('source', 'size', 'mtime_ns', 'sha256')},
+            'cache': cache,
+            'rows': len(df),
+            'first': first,
+            'last': last,
+            'ingested_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        summary['replaced' if entry else 'added'].append(name)
+        summary['rows'] += len(df)
+
+    if not (rebuilt or summary['added'] or summary['replaced']):
+        return summary
+    if cube is None:
+        cube = build_cube(_stack(base_cache, manifest))
+    write_frame(cube, cube_path, {'format': MANIFEST_FORMAT, 'base': manifest['base']['sha256']})
+    manifest['revision'] += 1
+    manifest['updated_at'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    write_manifest(manifest, manifest_path_for(csv_path, compact, cache_dir))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new monthly declaration batches.")
+    parser.add_argument('--partition-dir', default=PARTITION_DIR)
+    parser.add_argument('--csv-path', default=DATA_PATH, help="Base history CSV")
+    parser.add_argument('--compact', action='store_true', default=COMPACT_SCHEMA)
+    args = parser.parse_args()
+
+    summary = ingest(args.partition_dir, args.csv_path, args.compact)
+    print(f"Added {len(summary['added'])}, replaced {len(summary['replaced'])}, "
+          f"unchanged {len(summary['unchanged'])} partitions ({summary['rows']:,} new rows)")
+    if summary['rebuilt_cube']:
+        print("Cube rebuilt from the full dataset")
+
+
+if __name__ == '__main__':
+    main()
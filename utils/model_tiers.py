@@ -0,0 +1,175 @@
+"""Smaller, faster tiers of the price forest, chosen on validation accuracy.
+
+    python -m utils.model_tiers [--trees 10 25 50 100 200 400] [--depths 6 8 10 12 14]
+        [--fast-tolerance 0.02] [--balanced-tolerance 0.005] [--fast-latency-ms 1]
+        [--json models/tiers.json]
+
+The pickled forest is scored on the most recent ``--validation-share`` of the
+dataset, the same holdout utils.train keeps aside. For every depth cap the
+forest is compiled once (utils.compiled_forest). One vectorized pass then
+gives every tree's prediction for every row, and cumulative means over the
+trees give R^2 and RMSE for every tree count at once. A sub-forest of the
+first k trees shares the arrays of the capped forest, so its single-row
+latency is measured without recompiling.
+
+Tiers:
+- ``fast``: the quickest configuration within ``--fast-tolerance`` R^2 of the
+  full forest, preferring one under ``--fast-latency-ms`` per row;
+- ``balanced``: the quickest within ``--balanced-tolerance``;
+- ``full``: the forest as trained.
+
+Each reduced tier is written as a compiled forest next to the full one
+(``best_price_predictor.fast.forest``) and tagged with the source pickle's
+fingerprint. UG_MODEL_TIER then picks the tier that load_model serves. The
+report of accuracy, latency and size for every configuration is printed and,
+with --json, saved.
+"""
+import argparse
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+
+from utils.compiled_forest import CompiledForest, _source_fingerprint, compile_forest
+from utils.config import COMPILED_MODEL_PATH, DATA_PATH, MODEL_PATH
+from utils.features import build_features
+from utils.ingest import load_dataset
+
+TIERS = ['fast', 'balanced', 'full']
+
+
+def tier_path(tier, compiled_path=COMPILED_MODEL_PATH):
+    """Compiled forest for ``tier``; the full tier is the regular compiled model."""
+    if tier == 'full':
+        return compiled_path
+    stem, ext = os.path.splitext(compiled_path)
+    return f'{stem}.{tier}{ext}'
+
+
+def subforest(compiled, n_trees):
+    # The first n_trees roots over the same (memory-shared) node arrays
+    return CompiledForest(compiled.roots[:n_trees], compiled.feature, compiled.threshold, compiled.left,
+                          compiled.value, compiled.value_index, compiled.n_features_in_, compiled.max_depth)
+
+
+def tree_nodes(compiled):
+    """Nodes used by each tree, in tree order."""
+    ends = np.append(compiled.roots[1:], len(compiled.feature))
+    return ends - compiled.roots
+
+
+def single_row_ms(forest, X, repeat=50):
+    times = []
+    for i in range(repeat):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        forest.predict(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def validation_rows(preprocessor, csv_path, share, rows, seed=0):
+    df = load_dataset(csv_path)
+    valid = df.iloc[int(len(df) * (1 - share)):]
+    if rows and rows < len(valid):
+        valid = valid.sample(rows, random_state=seed)
+    X = preprocessor.transform(build_features(valid, preprocessor.feature_names_in_))
+    return X, valid['Unit_Price_UGX'].to_numpy(dtype='float64')
+
+
+def evaluate(model, X, y, tree_counts, depth_caps):
+    """Accuracy, single-row latency and size for every (trees, depth cap)."""
+    n_total = len(model.estimators_)
+    tree_counts = sorted({k for k in tree_counts if k < n_total} | {n_total})
+    total_ss = float(np.sum((y - y.mean()) ** 2))
+    results = []
+    for depth_cap in list(depth_caps) + [None]:
+        compiled = compile_forest(model, depth_cap=depth_cap)
+        per_tree = compiled.predict_per_tree(X)
+        running = np.cumsum(per_tree, axis=1)
+        nodes = np.cumsum(tree_nodes(compiled))
+        bytes_per_node = compiled.nbytes / len(compiled.feature)
+        for k in tree_counts:
+            error = y - running[:, k - 1] / k
+            sse = float(np.sum(error ** 2))
+            results.append({
+                'trees': k,
+                'depth_cap': depth_cap,
+                'r2': 1 - sse / total_ss if total_ss else 0.0,
+                'rmse': float(np.sqrt(sse / len(y))),
+                'single_row_ms': single_row_ms(subforest(compiled, k), X),
+                'megabytes': float(nodes[k - 1] * bytes_per_node / 2**20),
+            })
+    return results
+
+
+def choose_tiers(results, fast_tolerance, balanced_tolerance, fast_latency_ms):
+    full = next(r for r in results if r['depth_cap'] is None and r['trees'] == max(x['trees'] for x in results))
+    by_speed = sorted(results, key=lambda r: (r['single_row_ms'], r['megabytes']))
+
+    def quickest(tolerance, latency_ms=None):
+        good = [r for r in by_speed if r['r2'] >= full['r2'] - tolerance]
+        fast_enough = [r for r in good if latency_ms is None or r['single_row_ms'] <= latency_ms]
+        return (fast_enough or good or [full])[0]
+
+    return {
+        'fast': quickest(fast_tolerance, fast_latency_ms),
+        'balanced': quickest(balanced_tolerance),
+        'full': full,
+    }
+
+
+def export_tier(model, preprocessor, tier, choice, model_path=MODEL_PATH, compiled_path=COMPILED_MODEL_PATH):
+    compiled = compile_forest(model, n_trees=choice['trees'], depth_cap=choice['depth_cap'])
+    path = tier_path(tier, compiled_path)
+    compiled.save(path, source=_source_fingerprint(model_path), tier=tier,
+                  trees=choice['trees'], depth_cap=choice['depth_cap'])
+    joblib.dump(preprocessor, os.path.join(path, 'preprocessor.pkl'))
+    return path
+
+
+def print_report(results, tiers):
+    chosen = {(r['trees'], r['depth_cap']): tier for tier, r in tiers.items()}
+    print(f"{'trees':>6} {'depth':>6} {'R2':>7} {'RMSE':>14} {'1-row ms':>9} {'MB':>8}  tier")
+    for r in sorted(results, key=lambda r: (r['depth_cap'] is None, r['depth_cap'] or 0, r['trees'])):
+        depth = r['depth_cap'] if r['depth_cap'] is not None else 'full'
+        tier = chosen.get((r['trees'], r['depth_cap']), '')
+        print(f"{r['trees']:>6} {depth:>6} {r['r2']:>7.3f} {r['rmse']:>14,.0f} "
+              f"{r['single_row_ms']:>9.3f} {r['megabytes']:>8.1f}  {tier}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fast/balanced tiers of the price forest.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--compiled-path', default=COMPILED_MODEL_PATH)
+    parser.add_argument('--csv-path', default=DATA_PATH)
+    parser.add_argument('--trees', nargs='+', type=int, default=[10, 25, 50, 100, 200, 400])
+    parser.add_argument('--depths', nargs='+', type=int, default=[6, 8, 10, 12, 14])
+    parser.add_argument('--validation-share', type=float, default=0.2)
+    parser.add_argument('--rows', type=int, default=20_000, help="Validation rows to score")
+    parser.add_argument('--fast-tolerance', type=float, default=0.02, help="R2 the fast tier may lose")
+    parser.add_argument('--balanced-tolerance', type=float, default=0.005)
+    parser.add_argument('--fast-latency-ms', type=float, default=1.0)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args()
+
+    artifact = joblib.load(args.model_path)
+    model, preprocessor = artifact['model'], artifact['preprocessor']
+    X, y = validation_rows(preprocessor, args.csv_path, args.validation_share, args.rows)
+    results = evaluate(model, X, y, args.trees, args.depths)
+    tiers = choose_tiers(results, args.fast_tolerance, args.balanced_tolerance, args.fast_latency_ms)
+    print_report(results, tiers)
+
+    for tier in ('fast', 'balanced'):
+        path = export_tier(model, preprocessor, tier, tiers[tier], args.model_path, args.compiled_path)
+        print(f"{tier}: {tiers[tier]['trees']} trees, depth cap {tiers[tier]['depth_cap']} -> {path}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'validation_rows': len(y), 'tiers': tiers, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
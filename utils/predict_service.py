@@ -0,0 +1,195 @@
+"""Standalone HTTP prediction service with request micro-batching.
+
+The model and preprocessor are loaded once. Concurrent requests are queued and
+coalesced into a single ``transform``/``predict`` call once ``max_batch_size``
+records are waiting or the oldest has waited ``max_wait_ms``, so bursts of
+single-row requests share one pass over the forest.
+
+    python -m utils.predict_service [--port 8600] [--max-batch-size 64] [--max-wait-ms 5]
+
+Endpoints:
+    POST /predict  body: one declaration object, or {"records": [...]}
+                   reply: {"predictions": [...]}
+    GET  /health   reply: batching counters
+    GET  /metrics  span histograms in Prometheus text format (UG_METRICS=1)
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import pandas as pd
+import tornado.web
+
+from utils.features import build_features
+from utils.telemetry import prometheus_text, span
+
+DEFAULT_PORT = 8600
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+def make_predict_fn(model, preprocessor):
+    def predict(records):
+        with span('predict.features', mode='service'):
+            frame = build_features(pd.DataFrame.from_records(records), preprocessor.feature_names_in_)
+        with span('predict.transform', mode='service'):
+            processed = preprocessor.transform(frame)
+        with span('predict.model', mode='service'):
+            return model.predict(processed)
+    return predict
+
+
+class MicroBatcher:
+    """Coalesce concurrent predict calls into batches run off the event loop."""
+
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.records = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+
+    async def submit(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        pending = [await self.queue.get()]
+        size = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    async def _predict(self, pending):
+        loop = asyncio.get_running_loop()
+        records = [record for batch, _ in pending for record in batch]
+        try:
+            predictions = await loop.run_in_executor(None, self.predict_fn, records)
+        except Exception as e:
+            if len(pending) > 1:
+                # Retry requests one by one so a bad record only fails its own request
+                for item in pending:
+                    await self._predict([item])
+                return
+            _, future = pending[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.records += len(records)
+        start = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(predictions[start:start + len(batch)].tolist())
+            start += len(batch)
+
+    async def _run(self):
+        while True:
+            await self._predict(await self._collect())
+
+
+class PredictHandler(tornado.web.RequestHandler):
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    async def post(self):
+        try:
+            payload = json.loads(self.request.body)
+            records = payload['records'] if isinstance(payload, dict) and 'records' in payload else [payload]
+            if not records or not all(isinstance(record, dict) for record in records):
+                raise ValueError("Expected a declaration object or {\"records\": [...]}")
+        except (ValueError, TypeError) as e:
+            self.set_status(400)
+            self.write({'error': str(e)})
+            return
+
+        try:
+            predictions = await self.batcher.submit(records)
+        except (ValueError, KeyError) as e:
+            self.set_status(400)
+            self.write({'error': f"Prediction failed: {e}"})
+            return
+        self.write({'predictions': predictions})
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    def get(self):
+        batches = self.batcher.batches
+        self.write({
+            'status': 'ok',
+            'batches': batches,
+            'records': self.batcher.records,
+            'mean_batch_size': self.batcher.records / batches if batches else 0.0,
+            'queued': self.batcher.queue.qsize(),
+        })
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4')
+        self.write(prometheus_text())
+
+
+def make_app(batcher):
+    return tornado.web.Application([
+        (r'/predict', PredictHandler, {'batcher': batcher}),
+        (r'/health', HealthHandler, {'batcher': batcher}),
+        (r'/metrics', MetricsHandler),
+    ])
+
+
+async def serve(model, preprocessor, port=DEFAULT_PORT, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    batcher = MicroBatcher(make_predict_fn(model, preprocessor), max_batch_size, max_wait_ms)
+    batcher.start()
+    server = make_app(batcher).listen(port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        await batcher.stop()
+
+
+def main():
+    from utils.data_loader import read_model
+
+    parser = argparse.ArgumentParser(description="Serve unit-price predictions over HTTP.")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    model, preprocessor = read_model()
+    if model is None:
+        raise SystemExit("Model file not found. Please ensure it exists under /models.")
+    print(f"Serving predictions on http://localhost:{args.port}/predict "
+          f"(batch <= {args.max_batch_size}, wait <= {args.max_wait_ms} ms)")
+    asyncio.run(serve(model, preprocessor, args.port, args.max_batch_size, args.max_wait_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Bounded cache of price predictions.
+
+Entries are keyed on the canonicalized model-input row plus the version of the
+model artifact that produced them, evicted least-recently-used beyond
+``max_entries`` and dropped after ``ttl_seconds``. An optional SQLite file
+shares entries between processes. When the model version changes (a reload
+of a new artifact) the in-process entries are discarded. Disk rows are read
+only for the bound version and are never deleted for belonging to another
+one, so workers on different versions during a rollout share the file; old
+rows age out through the TTL and the entry bound. A prediction
+range is a single entry holding the (point, lower, upper) tuple.
+"""
+import hashlib
+import json
+import math
+import numbers
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.telemetry import span
+
+
+def _canonical(value):
+    # Numbers compare at 9 significant digits so 1, 1.0 and float noise share a key
+    if isinstance(value, (numbers.Number, np.number)) and not isinstance(value, bool):
+        value = float(value)
+        return 'nan' if math.isnan(value) else f'{value:.9g}'
+    return str(value).strip()
+
+
+def row_key(row, version):
+    text = '\x1f'.join([version] + [_canonical(value) for value in row])
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    def __init__(self, max_entries=1024, ttl_seconds=3600, disk_path=None, max_disk_entries=100_000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_disk(disk_path) if disk_path else None
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self.disk_hits = self.invalidations = 0
+
+    # ---- DISK TIER ----
+    @staticmethod
+    def _open_disk(path):
+        db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS predictions ('
+                   'key TEXT PRIMARY KEY, version TEXT, value REAL, expires REAL, used REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS predictions_used ON predictions (used)')
+        return db
+
+    def _disk_get(self, key, now):
+        row = self._db.execute('SELECT value, expires FROM predictions WHERE key = ? AND version = ?',
+                               (key, self.version)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._db.execute('DELETE FROM predictions WHERE key = ?', (key,))
+            return None
+        self._db.execute('UPDATE predictions SET used = ? WHERE key = ?', (now, key))
+        # Prediction ranges are stored as JSON text next to plain floats
+        return tuple(json.loads(row[0])) if isinstance(row[0], str) else row[0]
+
+    def _disk_put(self, items, now):
+        self._db.executemany(
+            'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)',
+            [(key, self.version, json.dumps(value) if isinstance(value, tuple) else value,
+              now + self.ttl_seconds, now) for key, value in items]
+        )
+        self._db.execute(
+            'DELETE FROM predictions WHERE key IN (SELECT key FROM predictions '
+            'ORDER BY used DESC LIMIT -1 OFFSET ?)', (self.max_disk_entries,)
+        )
+
+    # ---- PUBLIC API ----
+    def bind(self, version):
+        """Attach the cache to a model version, dropping in-process entries of any other."""
+        with self._lock:
+            if version == self.version:
+                return
+            if self.version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            if self._db is not None:
+                value = self._disk_get(key, now)
+                if value is not None:
+                    self._store(key, value, now)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put_many(self, items):
+        now = time.time()
+        with self._lock:
+            for key, value in items:
+                self._store(key, value, now)
+            if self._db is not None and items:
+                self._disk_put(items, now)
+
+    def _store(self, key, value, now):
+        self._entries[key] = (value, now + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM predictions')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'disk_hits': self.disk_hits,
+            'invalidations': self.invalidations,
+        }
+
+
+def cached_predict(cache, version, model, preprocessor, features):
+    """Predict every row of a model-input frame, running only the cache misses."""
+    cache.bind(version)
+    with span('predict.cache_lookup'):
+        keys = [row_key(row, version) for row in features.itertuples(index=False, name=None)]
+        predictions = np.array([cache.get(key) for key in keys], dtype='float64')
+    missing = np.flatnonzero(np.isnan(predictions))
+    if len(missing):
+        with span('predict.transform'):
+            processed = preprocessor.transform(features.iloc[missing])
+        with span('predict.model'):
+            fresh = model.predict(processed)
+        predictions[missing] = fresh
+        cache.put_many([(keys[i], float(value)) for i, value in zip(missing, fresh)])
+    return predictions
+
+
+def cached_predict_interval(cache, version, model, preprocessor, features, coverage):
+    """(point, lower, upper) arrays, like cached_predict; one entry per row holds all three."""
+    from utils.compiled_forest import predict_interval
+
+    cache.bind(version)
+    interval_version = f'{version}:interval:{coverage:g}'
+    with span('predict.cache_lookup'):
+        keys = [row_key(row, interval_version) for row in features.itertuples(index=False, name=None)]
+        values = [cache.get(key) for key in keys]
+    missing = [i for i, value in enumerate(values) if value is None]
+    if missing:
+        with span('predict.transform'):
+            processed = preprocessor.transform(features.iloc[missing])
+        with span('predict.interval'):
+            fresh = np.column_stack(predict_interval(model, processed, coverage))
+        for i, row in zip(missing, fresh):
+            values[i] = tuple(float(value) for value in row)
+        cache.put_many([(keys[i], values[i]) for i in missing])
+    point, lower, upper = np.array(values, dtype='float64').reshape(-1, 3).T
+    return point, lower, upper
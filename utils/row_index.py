@@ -0,0 +1,130 @@
+"""Row-offset index over the imports frame.
+
+The cached frame is stored sorted by (Year, Month), so any year range is a
+contiguous block of rows found with two binary searches. For the common
+filter columns the index also keeps, per distinct value, the ascending row
+positions holding it (an inverted list). A ``Selection`` starts as a year
+range and is narrowed with ``where`` / ``isin`` by intersecting those lists,
+so each filter costs time proportional to the rows it touches rather than to
+the table. ``Selection.frame`` returns a zero-copy slice while only a year
+range is applied and gathers just the selected rows otherwise.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+TIME_KEYS = ['Year', 'Month']
+
+INDEXED_COLUMNS = ['Country_of_Origin', 'Item_Description', 'Mode_of_Transport', 'HS_Code']
+
+
+def sort_by_time(df):
+    """Frame stably sorted by (Year, Month) with a fresh RangeIndex."""
+    keys = df[TIME_KEYS[0]].to_numpy().astype('int64') * 12 + df[TIME_KEYS[1]].to_numpy()
+    if len(keys) and not (np.diff(keys) >= 0).all():
+        df = df.take(np.argsort(keys, kind='stable'))
+    return df.reset_index(drop=True)
+
+
+class RowIndex:
+    def __init__(self, df, columns=INDEXED_COLUMNS):
+        years = df['Year'].to_numpy()
+        if len(years) and not (np.diff(years) >= 0).all():
+            raise ValueError("RowIndex needs a frame sorted by Year; use sort_by_time first")
+        self.n_rows = len(years)
+        self.years, self.year_starts = np.unique(years, return_index=True)
+        self._postings = {col: self._postings_for(df[col]) for col in columns if col in df}
+
+    @staticmethod
+    def _postings_for(column):
+        codes, values = pd.factorize(column, sort=True)
+        # Stable sort keeps the positions of every value ascending
+        positions = np.argsort(codes, kind='stable')
+        offsets = np.searchsorted(codes[positions], np.arange(len(values) + 1))
+        return pd.Index(values), offsets, positions
+
+    # ---- PERSISTENCE ----
+    def save(self, path):
+        """Arrays as memory-mappable .npy files plus a small index.json."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'years.npy'), self.years)
+        np.save(os.path.join(path, 'year_starts.npy'), self.year_starts)
+        for col, (values, offsets, positions) in self._postings.items():
+            np.save(os.path.join(path, f'{col}.values.npy'), values.to_numpy(), allow_pickle=True)
+            np.save(os.path.join(path, f'{col}.offsets.npy'), offsets)
+            np.save(os.path.join(path, f'{col}.positions.npy'), positions)
+        with open(os.path.join(path, 'index.json'), 'w') as f:
+            json.dump({'n_rows': self.n_rows, 'columns': list(self._postings)}, f)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        with open(os.path.join(path, 'index.json')) as f:
+            meta = json.load(f)
+
+        def array(name):
+            return np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+
+        index = cls.__new__(cls)
+        index.n_rows = meta['n_rows']
+        index.years, index.year_starts = array('years'), array('year_starts')
+        index._postings = {
+            col: (pd.Index(np.load(os.path.join(path, f'{col}.values.npy'), allow_pickle=True)),
+                  array(f'{col}.offsets'), array(f'{col}.positions'))
+            for col in meta['columns']
+        }
+        return index
+
+    def year_bounds(self, start, end):
+        """(lo, hi) row positions of start <= Year <= end."""
+        bounds = np.r_[self.year_starts, self.n_rows]
+        lo = bounds[np.searchsorted(self.years, start, side='left')]
+        hi = bounds[np.searchsorted(self.years, end, side='right')]
+        return int(lo), int(hi)
+
+    def rows(self, column, value):
+        """Ascending row positions where ``column == value``."""
+        values, offsets, positions = self._postings[column]
+        loc = values.get_indexer([value])[0]
+        if loc < 0:
+            return positions[:0]
+        return positions[offsets[loc]:offsets[loc + 1]]
+
+    def select(self, years=None):
+        lo, hi = self.year_bounds(*years) if years is not None else (0, self.n_rows)
+        return Selection(self, lo, hi)
+
+
+class Selection:
+    """Rows of an indexed frame: a year range, optionally narrowed further."""
+
+    def __init__(self, index, start, stop, positions=None):
+        self.index = index
+        self.start, self.stop = start, stop
+        self.positions = positions
+
+    def __len__(self):
+        return self.stop - self.start if self.positions is None else len(self.positions)
+
+    def _narrow(self, rows):
+        if self.positions is None:
+            lo, hi = np.searchsorted(rows, [self.start, self.stop])
+            positions = rows[lo:hi]
+        else:
+            positions = np.intersect1d(self.positions, rows, assume_unique=True)
+        return Selection(self.index, self.start, self.stop, positions)
+
+    def where(self, column, value):
+        return self._narrow(self.index.rows(column, value))
+
+    def isin(self, column, values):
+        lists = [self.index.rows(column, value) for value in values]
+        rows = np.sort(np.concatenate(lists)) if lists else np.empty(0, dtype=np.intp)
+        return self._narrow(rows)
+
+    def frame(self, df, columns=None):
+        """The selected rows of ``df``; a view while only years are applied."""
+        rows = slice(self.start, self.stop) if self.positions is None else self.positions
+        cols = slice(None) if columns is None else df.columns.get_indexer(columns)
+        return df.iloc[rows, cols]
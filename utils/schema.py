@@ -0,0 +1,106 @@
+"""Compact in-memory schema for the imports frame.
+
+String columns become categoricals with sorted (and therefore stable)
+dictionaries, Year/Month become small integers and the per-kg ratios drop to
+float32 where the values survive the round trip.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CATEGORICAL_COLUMNS = [
+    'HS_Code', 'Item_Description', 'Country_of_Origin', 'Port_of_Shipment',
+    'Mode_of_Transport', 'Quantity_Unit', 'Currency_Code', 'Valuation_Method'
+]
+
+SMALL_INT_COLUMNS = {'Year': 'int16', 'Month': 'int8'}
+
+FLOAT32_COLUMNS = ['Value_Density', 'FOB_per_kg', 'Freight_per_kg', 'Insurance_per_kg']
+
+# Largest relative error accepted when narrowing a ratio column to float32
+FLOAT32_RTOL = 1e-6
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def fits_float32(values, rtol=FLOAT32_RTOL):
+    values = np.asarray(values, dtype='float64')
+    narrowed = values.astype('float32').astype('float64')
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(narrowed)):
+        return False
+    return bool(np.allclose(narrowed[finite], values[finite], rtol=rtol, atol=0))
+
+
+def build_categories(df, columns=CATEGORICAL_COLUMNS):
+    """Sorted category dictionaries that can be shared between frames."""
+    return {
+        col: np.sort(df[col].dropna().unique())
+        for col in columns if col in df.columns
+    }
+
+
+def compact_frame(df, categories=None):
+    """Return a compact copy of df.
+
+    ``categories`` maps column names to shared dictionaries (see
+    build_categories); values missing from a supplied dictionary become NaN,
+    so pass dictionaries built from a superset of the data.
+    """
+    categories = categories or build_categories(df)
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if col in categories:
+            series = series.astype(pd.CategoricalDtype(categories[col]))
+        elif col in SMALL_INT_COLUMNS and pd.api.types.is_integer_dtype(series):
+            info = np.iinfo(SMALL_INT_COLUMNS[col])
+            if series.min() >= info.min and series.max() <= info.max:
+                series = series.astype(SMALL_INT_COLUMNS[col])
+        elif col in FLOAT32_COLUMNS and fits_float32(series):
+            series = series.astype('float32')
+        out[col] = series
+    return pd.DataFrame(out, index=df.index)
+
+
+def concat_frames(frames):
+    """Stack frames row-wise, merging categorical dictionaries.
+
+    A plain ``pd.concat`` falls back to object columns when the categories
+    differ; here they are unioned (sorted) so compact frames stay compact.
+    """
+    frames = [df for df in frames if len(df)] or list(frames[:1])
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    out = {}
+    for col in frames[0].columns:
+        parts = [df[col] for df in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            out[col] = union_categoricals(parts, sort_categories=True, ignore_order=True)
+        else:
+            out[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(out)
+
+
+def memory_report(before, after):
+    before_bytes, after_bytes = memory_bytes(before), memory_bytes(after)
+    return {
+        'before_bytes': before_bytes,
+        'after_bytes': after_bytes,
+        'ratio': before_bytes / max(after_bytes, 1),
+    }
+
+
+def with_plain_strings(df, columns):
+    """Swap categorical columns for plain values.
+
+    Plotly's hierarchical charts (treemap, sunburst) group their path columns
+    without ``observed=True``, so unused categories end up as zero-weight nodes.
+    """
+    plain = {
+        col: df[col].astype(object)
+        for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**plain) if plain else df
@@ -0,0 +1,264 @@
+"""Whole-dataset valuation screening for under-declared imports.
+
+Every declaration's Unit_Price_UGX is compared against the model's price:
+
+    python -m utils.screening [--workers N] [--partition-rows 100000] [--z 3.0] [--fresh]
+
+The dataset (as loaded by the app) is cut into fixed row ranges that a
+process pool scores in parallel. The pool has one worker per core by
+default. Workers are forked after the frame and model are loaded, so they
+share both copy-on-write instead of reloading them. Each finished partition
+is written on its own, atomically, under a run directory named after the
+data and model versions. An interrupted run started again with the same data
+and model therefore scores only the missing partitions.
+
+Once every partition is done, each row's log residual (declared / predicted)
+is turned into a robust z-score within its HS_Code/Country_of_Origin group.
+The centre is the median and the scale is 1.4826 x MAD. Groups with fewer
+than MIN_GROUP_ROWS rows fall back to the HS_Code group, then to the whole
+dataset. Rows at or below ``-z`` are flagged. The run then writes:
+- ``scores.arrow``: every row;
+- ``flagged.arrow``: the flagged declarations, most under-declared first;
+- ``summary.json``: counts and timings.
+
+A ``CURRENT`` pointer then moves to the run, and the dashboard reads from it.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar_cache import read_cache, write_frame
+from utils.config import (DATA_PATH, SCREENING_DIR, SCREENING_PARTITION_ROWS, SCREENING_WORKERS,
+                          SCREENING_Z)
+from utils.features import build_features
+from utils.ingest import data_version, load_dataset
+
+POINTER = 'CURRENT'
+TARGET = 'Unit_Price_UGX'
+PREDICTION_COLUMN = 'Predicted_Unit_Price_UGX'
+
+# Grouping levels tried in order; the empty level is the whole dataset
+GROUP_LEVELS = [['HS_Code', 'Country_of_Origin'], ['HS_Code'], []]
+MIN_GROUP_ROWS = 20
+MAD_SCALE = 1.4826
+
+# Columns kept next to the scores; flagged rows keep every column
+SCORE_COLUMNS = ['HS_Code', 'Country_of_Origin', 'Year', 'Month', TARGET]
+
+# Set in the parent before the pool forks; spawned workers fill it themselves
+_STATE = {}
+
+
+# ---- RUNS ----
+def run_fingerprint(csv_path, model_version, partition_rows):
+    stat = os.stat(csv_path)
+    text = json.dumps([os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns,
+                       data_version(csv_path), model_version, partition_rows])
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def current_run(screening_dir=SCREENING_DIR):
+    """Directory of the last completed run, or None."""
+    try:
+        with open(os.path.join(screening_dir, POINTER)) as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(screening_dir, name) if name else None
+
+
+def read_summary(run_dir):
+    with open(os.path.join(run_dir, 'summary.json')) as f:
+        return json.load(f)
+
+
+def read_flagged(run_dir):
+    return read_cache(os.path.join(run_dir, 'flagged.arrow'))
+
+
+def _part_path(run_dir, i):
+    return os.path.join(run_dir, 'parts', f'part-{i:05d}.arrow')
+
+
+# ---- SCORING ----
+def _load_state(csv_path):
+    from utils.data_loader import model_version, read_model
+    # Offline screening always uses the full forest, whatever tier the app serves
+    model, preprocessor = read_model(tier='full')
+    if model is None:
+        raise SystemExit("Model file not found. Please ensure it exists under /models.")
+    _STATE.update(df=load_dataset(csv_path), model=model, preprocessor=preprocessor,
+                  model_version=model_version(model) or 'unversioned')
+
+
+def _init_worker(csv_path):
+    if not _STATE:
+        _load_state(csv_path)
+    # One process per core already; threaded tree traversal would oversubscribe
+    if hasattr(_STATE['model'], 'n_jobs'):
+        _STATE['model'].n_jobs = 1
+
+
+def log_residuals(declared, predicted):
+    """log(declared / predicted); NaN where either price is not positive."""
+    declared = np.asarray(declared, dtype='float64')
+    predicted = np.asarray(predicted, dtype='float64')
+    valid = (declared > 0) & (predicted > 0)
+    out = np.full(len(declared), np.nan)
+    out[valid] = np.log(declared[valid]) - np.log(predicted[valid])
+    return out
+
+
+def score_partition(i, start, stop, out_path):
+    began = time.perf_counter()
+    df, model, preprocessor = _STATE['df'], _STATE['model'], _STATE['preprocessor']
+    rows = df.iloc[start:stop]
+    predicted = model.predict(preprocessor.transform(build_features(rows, preprocessor.feature_names_in_)))
+    part = pd.DataFrame({
+        'Row': np.arange(start, stop, dtype='int64'),
+        PREDICTION_COLUMN: predicted,
+        'Log_Residual': log_residuals(rows[TARGET], predicted),
+    })
+    write_frame(part, out_path, {'partition': i, 'start': start, 'stop': stop})
+    return i, stop - start, time.perf_counter() - began
+
+
+# ---- Z-SCORES ----
+def robust_z(residuals, frame, levels=GROUP_LEVELS, min_rows=MIN_GROUP_ROWS):
+    """Robust z-score of each residual within the finest usable group.
+
+    Returns (z, level) where ``level`` is the index into ``levels`` used for
+    each row.
+    """
+    residuals = pd.Series(np.asarray(residuals, dtype='float64'), index=frame.index)
+    centre = np.full(len(residuals), np.nan)
+    scale = np.full(len(residuals), np.nan)
+    level = np.full(len(residuals), -1, dtype='int8')
+    for i, columns in enumerate(levels):
+        if columns:
+            groups = residuals.groupby([frame[col] for col in columns], observed=True, sort=False)
+            median = groups.transform('median')
+            count = groups.transform('count')
+            mad = (residuals - median).abs().groupby([frame[col] for col in columns],
+                                                     observed=True, sort=False).transform('median')
+        else:
+            median = pd.Series(residuals.median(), index=residuals.index)
+            count = pd.Series(residuals.count(), index=residuals.index)
+            mad = pd.Series((residuals - median).abs().median(), index=residuals.index)
+        usable = (level < 0) & (count.to_numpy() >= min_rows) & (mad.to_numpy() > 0)
+        centre[usable] = median.to_numpy()[usable]
+        scale[usable] = MAD_SCALE * mad.to_numpy()[usable]
+        level[usable] = i
+    return (residuals.to_numpy() - centre) / scale, level
+
+
+def finalize(run_dir, df, n_parts, z_threshold):
+    parts = pd.concat([read_cache(_part_path(run_dir, i)) for i in range(n_parts)], ignore_index=True)
+    rows = parts['Row'].to_numpy()
+    scores = df[SCORE_COLUMNS].iloc[rows].reset_index(drop=True)
+    scores.insert(0, 'Row', rows)
+    scores[PREDICTION_COLUMN] = parts[PREDICTION_COLUMN].to_numpy()
+    scores['Log_Residual'] = parts['Log_Residual'].to_numpy()
+    scores['Z_Score'], scores['Group_Level'] = robust_z(scores['Log_Residual'], scores)
+    scores['Flagged'] = scores['Z_Score'] <= -z_threshold
+    write_frame(scores, os.path.join(run_dir, 'scores.arrow'), {'z': z_threshold})
+
+    flagged_scores = scores[scores['Flagged']].sort_values('Z_Score')
+    flagged = df.iloc[flagged_scores['Row'].to_numpy()].reset_index(drop=True)
+    for col in ['Row', PREDICTION_COLUMN, 'Log_Residual', 'Z_Score']:
+        flagged[col] = flagged_scores[col].to_numpy()
+    write_frame(flagged, os.path.join(run_dir, 'flagged.arrow'), {'z': z_threshold})
+    return len(scores), len(flagged)
+
+
+# ---- JOB ----
+def screen(csv_path=DATA_PATH, screening_dir=SCREENING_DIR, workers=SCREENING_WORKERS,
+           partition_rows=SCREENING_PARTITION_ROWS, z_threshold=SCREENING_Z, fresh=False, on_progress=None):
+    """Score every row, resuming a matching earlier run; returns the summary."""
+    started = time.perf_counter()
+    _load_state(csv_path)
+    df = _STATE['df']
+    workers = workers or os.cpu_count() or 1
+
+    run = run_fingerprint(csv_path, _STATE['model_version'], partition_rows)
+    run_dir = os.path.join(screening_dir, run)
+    if fresh:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(os.path.join(run_dir, 'parts'), exist_ok=True)
+
+    bounds = [(start, min(start + partition_rows, len(df))) for start in range(0, len(df), partition_rows)]
+    pending = [i for i in range(len(bounds)) if not os.path.exists(_part_path(run_dir, i))]
+    timings = []
+    score_started = time.perf_counter()
+    if pending:
+        # Fork shares the loaded frame and model; elsewhere each worker loads its own
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method),
+                                 initializer=_init_worker, initargs=(csv_path,)) as pool:
+            futures = [pool.submit(score_partition, i, *bounds[i], _part_path(run_dir, i)) for i in pending]
+            for future in as_completed(futures):
+                i, n_rows, seconds = future.result()
+                timings.append({'partition': i, 'rows': n_rows, 'seconds': seconds})
+                if on_progress:
+                    on_progress(len(bounds) - len(pending) + len(timings), len(bounds))
+    score_seconds = time.perf_counter() - score_started
+    scored_rows = sum(timing['rows'] for timing in timings)
+
+    n_rows, n_flagged = finalize(run_dir, df, len(bounds), z_threshold)
+    summary = {
+        'run': run,
+        'rows': n_rows,
+        'flagged': n_flagged,
+        'z_threshold': z_threshold,
+        'model_version': _STATE['model_version'],
+        'workers': workers,
+        'partitions': len(bounds),
+        'resumed_partitions': len(bounds) - len(pending),
+        'score_seconds': score_seconds,
+        'rows_per_second': scored_rows / score_seconds if scored_rows else None,
+        'total_seconds': time.perf_counter() - started,
+        'completed_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'partition_timings': sorted(timings, key=lambda timing: timing['partition']),
+    }
+    with open(os.path.join(run_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    pointer = os.path.join(screening_dir, POINTER)
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(run)
+    os.replace(pointer + '.tmp', pointer)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag under-declared imports across the whole dataset.")
+    parser.add_argument('--csv-path', default=DATA_PATH)
+    parser.add_argument('--screening-dir', default=SCREENING_DIR)
+    parser.add_argument('--workers', type=int, default=SCREENING_WORKERS, help="0 means one per core")
+    parser.add_argument('--partition-rows', type=int, default=SCREENING_PARTITION_ROWS)
+    parser.add_argument('--z', type=float, default=SCREENING_Z, help="Flag rows with z-score <= -Z")
+    parser.add_argument('--fresh', action='store_true', help="Discard finished partitions of this run")
+    args = parser.parse_args()
+
+    def report(done, total):
+        print(f"\r{done}/{total} partitions scored", end='', file=sys.stderr, flush=True)
+
+    summary = screen(args.csv_path, args.screening_dir, args.workers, args.partition_rows,
+                     args.z, args.fresh, report)
+    rate = f"{summary['rows_per_second']:,.0f} rows/s" if summary['rows_per_second'] else "all resumed"
+    print(f"\nScreened {summary['rows']:,} rows with {summary['workers']} workers ({rate}); "
+          f"{summary['flagged']:,} flagged at z <= -{summary['z_threshold']:g}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
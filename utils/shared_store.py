@@ -0,0 +1,179 @@
+"""Shared, memory-mapped snapshots of the dataset and model for many workers.
+
+Each Streamlit process normally loads its own copy of the frame and the
+forest. A publisher instead writes one immutable, versioned snapshot
+directory under SHARED_DIR:
+- ``dataset.arrow``: the full frame (base plus ingested partitions) in the
+  schema UG_COMPACT_SCHEMA selects, with every string column
+  dictionary-encoded, so each column maps back as a zero-copy view of the
+  file. The schema is recorded in ``meta.json``, and workers configured for
+  the other schema load locally instead of attaching;
+- ``cube.arrow``: the report cube;
+- ``index/``: the RowIndex arrays as .npy files;
+- ``model.forest/``: the compiled forest (utils.compiled_forest), or
+  ``model.pkl`` when the model cannot be compiled.
+
+When the snapshot is complete, a ``CURRENT`` file naming it is swapped in
+atomically. Workers attach with read-only memory maps, so the pages live
+once in the OS page cache however many workers there are, and a new worker
+starts without parsing anything. Reading ``CURRENT`` is a single small file
+read, and workers do it on each access to learn about new versions. Older
+snapshots stay on disk (the last ``keep`` of them) while workers still map
+them.
+
+    python -m utils.shared_store publish [--keep 2]
+    python -m utils.shared_store status
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import joblib
+
+from utils.columnar_cache import read_cache, write_frame
+from utils.compiled_forest import export_compiled, is_current, load_compiled
+from utils.config import COMPACT_SCHEMA, COMPILED_MODEL_PATH, DATA_PATH, MODEL_PATH, SHARED_DIR
+from utils.cube import build_cube
+from utils.ingest import load_dataset
+from utils.row_index import RowIndex
+
+POINTER = 'CURRENT'
+
+
+# ---- VERSIONS ----
+def published_version(shared_dir=SHARED_DIR):
+    """Name of the current snapshot, or None if nothing was published."""
+    try:
+        with open(os.path.join(shared_dir, POINTER)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _versions(shared_dir):
+    return sorted(
+        name for name in os.listdir(shared_dir)
+        if not name.endswith('.tmp') and os.path.isfile(os.path.join(shared_dir, name, 'meta.json'))
+    )
+
+
+def _shareable(df):
+    # Object columns cannot be memory-mapped; dictionary-encode them
+    strings = [col for col in df.columns if df[col].dtype == object]
+    return df.astype({col: 'category' for col in strings}) if strings else df
+
+
+def _publish_model(out_dir, model_path, compiled_path):
+    if is_current(compiled_path, model_path) and os.path.isdir(compiled_path):
+        shutil.copytree(compiled_path, os.path.join(out_dir, 'model.forest'))
+        return 'compiled'
+    if not os.path.exists(model_path):
+        return None
+    try:
+        export_compiled(model_path, os.path.join(out_dir, 'model.forest'))
+        return 'compiled'
+    except TypeError:
+        # Not a tree ensemble: workers load the pickle themselves
+        shutil.copy2(model_path, os.path.join(out_dir, 'model.pkl'))
+        return 'pickle'
+
+
+def publish(shared_dir=SHARED_DIR, csv_path=DATA_PATH, model_path=MODEL_PATH,
+            compiled_path=COMPILED_MODEL_PATH, keep=2, compact=COMPACT_SCHEMA):
+    """Write a new snapshot, point CURRENT at it and prune old ones."""
+    version = time.strftime('%Y%m%dT%H%M%S') + f'-{os.getpid()}'
+    out_dir = os.path.join(shared_dir, version)
+    tmp_dir = out_dir + '.tmp'
+    os.makedirs(tmp_dir)
+
+    df = _shareable(load_dataset(csv_path, compact))
+    write_frame(df, os.path.join(tmp_dir, 'dataset.arrow'), {'version': version})
+    write_frame(build_cube(df), os.path.join(tmp_dir, 'cube.arrow'), {'version': version})
+    RowIndex(df).save(os.path.join(tmp_dir, 'index'))
+    model = _publish_model(tmp_dir, model_path, compiled_path)
+
+    meta = {
+        'version': version,
+        'rows': len(df),
+        'compact': compact,
+        'model': model,
+        'published_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_dir, out_dir)
+
+    pointer = os.path.join(shared_dir, POINTER)
+    with open(pointer + '.tmp', 'w') as f:
+        f.write(version)
+    os.replace(pointer + '.tmp', pointer)
+
+    # Unlinking is safe for workers that still map an old snapshot
+    for old in _versions(shared_dir)[:-keep]:
+        shutil.rmtree(os.path.join(shared_dir, old), ignore_errors=True)
+    return meta
+
+
+# ---- ATTACHING ----
+class Snapshot:
+    """Read-only views of one published snapshot."""
+
+    def __init__(self, shared_dir, version):
+        self.version = version
+        path = os.path.join(shared_dir, version)
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.frame = read_cache(os.path.join(path, 'dataset.arrow'))
+        self.cube = read_cache(os.path.join(path, 'cube.arrow'))
+        self.index = RowIndex.load(os.path.join(path, 'index'))
+        self.model = self.preprocessor = None
+        if self.meta['model'] == 'compiled':
+            self.model, self.preprocessor = load_compiled(os.path.join(path, 'model.forest'))
+        elif self.meta['model'] == 'pickle':
+            artifact = joblib.load(os.path.join(path, 'model.pkl'))
+            self.model, self.preprocessor = artifact['model'], artifact['preprocessor']
+
+
+def schema_compact(meta):
+    # Snapshots from before the schema was recorded were always compact
+    return meta.get('compact', True)
+
+
+def attach(shared_dir=SHARED_DIR):
+    """The current snapshot, or None if nothing was published."""
+    version = published_version(shared_dir)
+    return Snapshot(shared_dir, version) if version else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish or inspect shared dataset/model snapshots.")
+    parser.add_argument('command', choices=['publish', 'status'])
+    parser.add_argument('--shared-dir', default=SHARED_DIR or 'data/shared')
+    parser.add_argument('--keep', type=int, default=2, help="Snapshots to keep on disk")
+    parser.add_argument('--compact', action='store_true', default=COMPACT_SCHEMA,
+                        help="Publish the compact float32 schema (the default with UG_COMPACT_SCHEMA)")
+    args = parser.parse_args()
+
+    if args.command == 'publish':
+        os.makedirs(args.shared_dir, exist_ok=True)
+        meta = publish(args.shared_dir, keep=args.keep, compact=args.compact)
+        print(f"Published {meta['version']}: {meta['rows']:,} rows, model: {meta['model'] or 'none'}")
+        return
+
+    version = published_version(args.shared_dir)
+    if version is None:
+        print(f"Nothing published under {args.shared_dir}")
+        return
+    snapshot = Snapshot(args.shared_dir, version)
+    frame_mb = snapshot.frame.memory_usage(deep=False).sum() / 2**20
+    print(f"Current: {version} ({snapshot.meta['published_at']}), {len(snapshot.frame):,} rows, "
+          f"{frame_mb:,.1f} MB mapped, {'compact' if schema_compact(snapshot.meta) else 'full'} schema, "
+          f"model: {snapshot.meta['model'] or 'none'}")
+    print("Kept: " + ', '.join(_versions(args.shared_dir)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Out-of-core aggregation for histories larger than memory.
+
+With UG_STREAMING set, the app never materializes the full imports frame.
+The base CSV is read in chunks of STREAM_CHUNK_ROWS, followed by any ingested
+partitions (utils.ingest). Each chunk is folded into a StreamSummary:
+- the report cube, whose measures are additive sums and counts, so partial
+  cubes merge exactly;
+- a uniform random sample of STREAM_SAMPLE_ROWS rows, for the views that need
+  individual declarations (scatter plots, summaries, form options).
+
+The sample is kept as the rows with the smallest random keys, which makes it
+mergeable as well. Memory is bounded by the chunk size, the sample size and
+the number of cube cells. It does not grow with the number of rows.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.columnar_cache import read_cache
+from utils.config import CACHE_DIR, COMPACT_SCHEMA, DATA_PATH, STREAM_CHUNK_ROWS, STREAM_SAMPLE_ROWS
+from utils.cube import build_cube, combine_cubes
+from utils.features import add_derived_features
+from utils.ingest import partition_caches
+from utils.row_index import sort_by_time
+from utils.schema import compact_frame, concat_frames
+
+SAMPLE_KEY = '_sample_key'
+
+
+def iter_chunks(csv_path=DATA_PATH, chunksize=STREAM_CHUNK_ROWS, compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    """Frames of at most ``chunksize`` rows with the derived features added."""
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk = add_derived_features(chunk)
+        yield compact_frame(chunk) if compact else chunk
+    for path in partition_caches(csv_path, compact, cache_dir):
+        yield read_cache(path)
+
+
+class StreamSummary:
+    def __init__(self, sample_rows=STREAM_SAMPLE_ROWS, seed=0):
+        self.sample_rows = sample_rows
+        self.rows = 0
+        self._cube = None
+        self._pending = []
+        self._pending_cells = 0
+        self._sample = None
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self._merge_cube(build_cube(chunk))
+        self._merge_sample(chunk.assign(**{SAMPLE_KEY: self._rng.random(len(chunk))}))
+        return self
+
+    def merge(self, other):
+        """Fold in a summary built elsewhere, e.g. by another worker."""
+        self.rows += other.rows
+        if other.cube is not None:
+            self._merge_cube(other.cube)
+        if other._sample is not None:
+            self._merge_sample(other._sample)
+        return self
+
+    @property
+    def cube(self):
+        self._flush_cubes()
+        return self._cube
+
+    def _merge_cube(self, cube):
+        # Partial cubes wait until they add up to the merged cube's size and
+        # are then folded in by one groupby, so a growing cube is regrouped
+        # a logarithmic number of times rather than once per chunk
+        self._pending.append(cube)
+        self._pending_cells += len(cube)
+        if self._cube is None or self._pending_cells >= len(self._cube):
+            self._flush_cubes()
+
+    def _flush_cubes(self):
+        if self._pending:
+            parts = self._pending if self._cube is None else [self._cube] + self._pending
+            self._cube = combine_cubes(parts)
+            self._pending, self._pending_cells = [], 0
+
+    def _merge_sample(self, rows):
+        if self._sample is not None:
+            if len(self._sample) >= self.sample_rows:
+                # Only rows that beat the current largest key can enter
+                rows = rows[rows[SAMPLE_KEY] < self._sample[SAMPLE_KEY].max()]
+            rows = concat_frames([self._sample, rows])
+        if len(rows) > self.sample_rows:
+            rows = rows.nsmallest(self.sample_rows, SAMPLE_KEY)
+        self._sample = rows
+
+    def sample(self):
+        """The sampled rows in (Year, Month) order, like the in-memory frame."""
+        if self._sample is None:
+            return pd.DataFrame()
+        return sort_by_time(self._sample.drop(columns=SAMPLE_KEY))
+
+
+def stream_summary(csv_path=DATA_PATH, chunksize=STREAM_CHUNK_ROWS, sample_rows=STREAM_SAMPLE_ROWS,
+                   compact=COMPACT_SCHEMA, cache_dir=CACHE_DIR):
+    summary = StreamSummary(sample_rows)
+    for chunk in iter_chunks(csv_path, chunksize, compact, cache_dir):
+        summary.update(chunk)
+    return summary
@@ -0,0 +1,201 @@
+"""Timing spans for the hot paths: loading, reports, figures and prediction.
+
+Instrumentation is off by default. While it is off, ``span`` returns one
+shared no-op context manager and ``timed`` returns the function unchanged,
+so instrumented code costs a function call at most. With UG_METRICS=1 every
+span is:
+- kept in a ring buffer of the last METRICS_HISTORY spans (Performance page);
+- added to per-span latency histograms (``prometheus_text``), which are
+  served on /metrics when UG_METRICS_PORT is set;
+- logged as one JSON line on the ``utils.telemetry`` logger when
+  UG_METRICS_LOG=1.
+
+Spans nest per thread, and each one records the span it ran inside.
+"""
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.config import METRICS_ENABLED, METRICS_HISTORY, METRICS_LOG, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NOOP = contextlib.nullcontext()
+
+
+class Recorder:
+    def __init__(self, history=500, log=False):
+        self.recent = deque(maxlen=history)
+        self.log = log
+        self._series = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def record(self, name, labels, started_at, seconds, parent, error):
+        entry = {
+            'span': name,
+            'labels': labels,
+            'started_at': started_at,
+            'ms': seconds * 1000,
+            'parent': parent,
+            'thread': threading.current_thread().name,
+            'error': error,
+        }
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.recent.append(entry)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'count': 0, 'sum': 0.0, 'errors': 0, 'buckets': [0] * len(BUCKETS)}
+            series['count'] += 1
+            series['sum'] += seconds
+            series['errors'] += error
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series['buckets'][i] += 1
+        if self.log:
+            logger.info(json.dumps(entry, default=str))
+
+    def spans(self):
+        with self._lock:
+            return list(self.recent)
+
+    def totals(self):
+        """{(span, labels): count/sum/errors/buckets} since the process started."""
+        with self._lock:
+            return {key: {**series, 'buckets': list(series['buckets'])} for key, series in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self._series.clear()
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'labels', 'parent', 'started_at', 'start')
+
+    def __init__(self, recorder, name, labels):
+        self.recorder = recorder
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        stack = self.recorder.stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.recorder.stack().pop()
+        self.recorder.record(self.name, self.labels, self.started_at, seconds, self.parent, exc_type is not None)
+        return False
+
+
+RECORDER = Recorder(METRICS_HISTORY, METRICS_LOG) if METRICS_ENABLED else None
+
+
+def enabled():
+    return RECORDER is not None
+
+
+def span(name, **labels):
+    """Context manager timing a block as ``name``; a no-op while disabled."""
+    if RECORDER is None:
+        return _NOOP
+    return _Span(RECORDER, name, {key: str(value) for key, value in labels.items()})
+
+
+def timed(name, **labels):
+    """Decorator timing every call as ``name``; leaves the function as is while disabled."""
+    def decorate(fn):
+        if RECORDER is None:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---- EXPORT ----
+def _label_text(labels):
+    def escape(value):
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in labels)
+
+
+def prometheus_text():
+    """Span histograms in the Prometheus text exposition format."""
+    if RECORDER is None:
+        return ''
+    lines = [
+        '# HELP ug_span_seconds Time spent in instrumented code paths.',
+        '# TYPE ug_span_seconds histogram',
+    ]
+    errors = []
+    for (name, labels), series in sorted(RECORDER.totals().items()):
+        base = _label_text((('span', name),) + labels)
+        for bound, count in zip(BUCKETS, series['buckets']):
+            lines.append(f'ug_span_seconds_bucket{{{base},le="{bound}"}} {count}')
+        lines.append(f'ug_span_seconds_bucket{{{base},le="+Inf"}} {series["count"]}')
+        lines.append(f'ug_span_seconds_sum{{{base}}} {series["sum"]:.6f}')
+        lines.append(f'ug_span_seconds_count{{{base}}} {series["count"]}')
+        errors.append(f'ug_span_errors_total{{{base}}} {series["errors"]}')
+    lines += ['# HELP ug_span_errors_total Instrumented calls that raised.',
+              '# TYPE ug_span_errors_total counter'] + errors
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics on ``port`` from a daemon thread, once per process."""
+    global _server
+    if RECORDER is None or not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(('', port), _MetricsHandler)
+            except OSError as e:
+                # Another worker on this host already serves the port
+                logger.warning("Metrics server not started on port %s: %s", port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
@@ -0,0 +1,265 @@
+"""Scripted, reproducible training of the unit-price model.
+
+    python -m utils.train [--search-iter 12] [--folds 5] [--n-estimators 1200]
+        [--workers N] [--sample N] [--promote]
+
+Steps:
+1. Load the app's dataset (base CSV plus ingested partitions, in time order)
+   and build the model inputs with utils.features. The most recent
+   ``--holdout`` share is kept aside for the final evaluation.
+2. Cut the rest into TimeSeriesSplit folds. Each fold's preprocessor is
+   fitted once and its encoded matrices reused by every candidate. They are
+   also cached on disk with joblib.Memory, so a re-run on the same data
+   skips the encoding.
+3. Sample ``--search-iter`` hyperparameter sets around the README's forest
+   and fit every (candidate, fold) pair in a joblib process pool, one
+   single-threaded forest per core. Search forests use ``--search-estimators``
+   trees. Only the ranking matters here.
+4. Refit the preprocessor and a ``--n-estimators`` forest with the best
+   parameters on all training rows, using every core, and score it on the
+   holdout.
+
+Each run writes a versioned directory under MODEL_VERSIONS_DIR:
+- ``model.pkl``: {'model', 'preprocessor', 'params', 'version'}, loadable
+  wherever best_price_predictor.pkl is;
+- ``metrics.json``: CV results per candidate, holdout RMSE/MAE/R^2, a
+  per-stage timing breakdown and the data, code and library versions.
+
+With --promote the artifact also replaces MODEL_PATH atomically. Every random
+choice is seeded by --seed.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import ParameterSampler, TimeSeriesSplit
+
+from utils.config import CACHE_DIR, DATA_PATH, MODEL_PATH, MODEL_VERSIONS_DIR
+from utils.data_loader import TARGET, categorical_features, make_preprocessor, numeric_features
+from utils.features import build_features
+from utils.ingest import data_version, load_dataset
+
+FEATURES = numeric_features + categorical_features
+
+# Best parameters reported in the README; always one of the candidates
+README_PARAMS = {'max_depth': 18, 'min_samples_split': 5, 'max_features': 'log2', 'bootstrap': False}
+
+SEARCH_SPACE = {
+    'max_depth': [12, 18, 24, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['log2', 'sqrt', 0.3],
+    'bootstrap': [False, True],
+}
+
+
+@contextmanager
+def stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def candidates(n_iter, seed):
+    sampled = ParameterSampler(SEARCH_SPACE, n_iter=max(n_iter - 1, 0), random_state=seed)
+    # Every candidate gets all searched keys, so the README set is recognised when sampled
+    params = [{'min_samples_leaf': 1, **p} for p in [README_PARAMS, *sampled]]
+    unique = []
+    for p in params:
+        if p not in unique:
+            unique.append(p)
+    return unique
+
+
+def scores(y_true, y_pred):
+    return {
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'r2': float(r2_score(y_true, y_pred)),
+    }
+
+
+# ---- CROSS-VALIDATION ----
+def encode_fold(X_train, y_train, X_valid, encoding):
+    """Fit a fresh preprocessor on one fold; returns it with both encoded sides."""
+    preprocessor = make_preprocessor(encoding)
+    train = preprocessor.fit_transform(X_train, y_train)
+    return preprocessor, train, preprocessor.transform(X_valid)
+
+
+def fit_candidate(params, n_estimators, seed, train, y_train, valid, y_valid):
+    model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=1, random_state=seed, **params)
+    start = time.perf_counter()
+    model.fit(train, y_train)
+    fit_s = time.perf_counter() - start
+    return {**scores(y_valid, model.predict(valid)), 'fit_s': fit_s}
+
+
+def cross_validate(X, y, params_list, folds, n_estimators, encoding, workers, seed, memory, timings):
+    splits = list(TimeSeriesSplit(n_splits=folds).split(X))
+    encode = memory.cache(encode_fold) if memory else encode_fold
+    with stage(timings, 'cv_preprocess'):
+        encoded = joblib.Parallel(n_jobs=min(workers, folds))(
+            joblib.delayed(encode)(X.iloc[train_rows], y[train_rows], X.iloc[valid_rows], encoding)
+            for train_rows, valid_rows in splits
+        )
+    with stage(timings, 'cv_search'):
+        # Large encoded matrices are memory-mapped into the workers, not copied
+        results = joblib.Parallel(n_jobs=workers, max_nbytes='1M')(
+            joblib.delayed(fit_candidate)(params, n_estimators, seed,
+                                          encoded[k][1], y[train_rows], encoded[k][2], y[valid_rows])
+            for params in params_list
+            for k, (train_rows, valid_rows) in enumerate(splits)
+        )
+
+    summary = []
+    for i, params in enumerate(params_list):
+        fold_results = results[i * folds:(i + 1) * folds]
+        summary.append({
+            'params': params,
+            'folds': fold_results,
+            **{f'mean_{key}': float(np.mean([r[key] for r in fold_results])) for key in ('rmse', 'mae', 'r2')},
+        })
+    return sorted(summary, key=lambda result: result['mean_rmse'])
+
+
+# ---- ARTIFACT ----
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_artifact(out_dir, version, model, preprocessor, params, metrics):
+    if os.path.exists(out_dir):
+        raise FileExistsError(f"Model version {out_dir} already exists; refusing to overwrite it")
+    tmp_dir = out_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    artifact = {'model': model, 'preprocessor': preprocessor, 'params': params, 'version': version}
+    joblib.dump(artifact, os.path.join(tmp_dir, 'model.pkl'))
+    with open(os.path.join(tmp_dir, 'metrics.json'), 'w') as f:
+        json.dump(metrics, f, indent=2, default=str)
+    os.replace(tmp_dir, out_dir)
+    return os.path.join(out_dir, 'model.pkl')
+
+
+def promote(artifact_path, model_path=MODEL_PATH):
+    """Point the app at a trained artifact by replacing MODEL_PATH atomically."""
+    tmp = f'{model_path}.{os.getpid()}.tmp'
+    shutil.copy2(artifact_path, tmp)
+    os.replace(tmp, model_path)
+
+
+# ---- JOB ----
+def train(csv_path=DATA_PATH, versions_dir=MODEL_VERSIONS_DIR, folds=5, search_iter=12,
+          search_estimators=100, n_estimators=1200, holdout=0.2, encoding='onehot',
+          workers=0, sample=0, seed=42, cache_dir=CACHE_DIR):
+    timings = {}
+    workers = workers or os.cpu_count() or 1
+    started_at = datetime.now(timezone.utc)
+
+    with stage(timings, 'load'):
+        df = load_dataset(csv_path)
+        if sample and sample < len(df):
+            # Keep time order so the folds and the holdout stay chronological
+            df = df.sample(sample, random_state=seed).sort_index()
+    with stage(timings, 'features'):
+        X = build_features(df, FEATURES)
+        y = df[TARGET].to_numpy(dtype='float64')
+    cut = int(len(X) * (1 - holdout))
+    X_train, y_train, X_test, y_test = X.iloc[:cut], y[:cut], X.iloc[cut:], y[cut:]
+
+    memory = joblib.Memory(os.path.join(cache_dir, 'train'), verbose=0) if cache_dir else None
+    params_list = candidates(search_iter, seed)
+    cv = cross_validate(X_train, y_train, params_list, folds, search_estimators, encoding,
+                        workers, seed, memory, timings)
+    best = cv[0]['params']
+
+    with stage(timings, 'final_preprocess'):
+        preprocessor = make_preprocessor(encoding)
+        encoded_train = preprocessor.fit_transform(X_train, y_train)
+    with stage(timings, 'final_fit'):
+        model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=workers, random_state=seed, **best)
+        model.fit(encoded_train, y_train)
+    with stage(timings, 'evaluate'):
+        holdout_scores = scores(y_test, model.predict(preprocessor.transform(X_test)))
+    model.n_jobs = -1
+
+    # The pid keeps runs started in the same second on the same data apart
+    version = started_at.strftime('%Y%m%dT%H%M%S') + f'-{data_version(csv_path) or "base"}-{os.getpid()}'
+    metrics = {
+        'version': version,
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'data': {'csv_path': os.path.abspath(csv_path), 'data_version': data_version(csv_path),
+                 'rows': len(df), 'train_rows': cut, 'holdout_rows': len(X) - cut},
+        'config': {'folds': folds, 'search_iter': search_iter, 'search_estimators': search_estimators,
+                   'n_estimators': n_estimators, 'holdout': holdout, 'encoding': encoding,
+                   'workers': workers, 'sample': sample, 'seed': seed},
+        'best_params': best,
+        'holdout': holdout_scores,
+        'cv': cv,
+        'timings_s': timings,
+        'environment': {'python': platform.python_version(), 'sklearn': sklearn.__version__,
+                        'numpy': np.__version__, 'joblib': joblib.__version__, 'commit': git_commit()},
+    }
+    out_dir = os.path.join(versions_dir, version)
+    with stage(timings, 'save'):
+        artifact_path = save_artifact(out_dir, version, model, preprocessor,
+                                      {**best, 'n_estimators': n_estimators}, metrics)
+    # Rewrite so the breakdown includes saving
+    with open(os.path.join(out_dir, 'metrics.json'), 'w') as f:
+        json.dump(metrics, f, indent=2, default=str)
+    return artifact_path, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and version the unit-price model.")
+    parser.add_argument('--csv-path', default=DATA_PATH)
+    parser.add_argument('--versions-dir', default=MODEL_VERSIONS_DIR)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--search-iter', type=int, default=12, help="Hyperparameter sets to try")
+    parser.add_argument('--search-estimators', type=int, default=100, help="Trees per forest during the search")
+    parser.add_argument('--n-estimators', type=int, default=1200, help="Trees in the final forest")
+    parser.add_argument('--holdout', type=float, default=0.2, help="Most recent share kept for evaluation")
+    parser.add_argument('--encoding', default='onehot')
+    parser.add_argument('--workers', type=int, default=0, help="0 means one per core")
+    parser.add_argument('--sample', type=int, default=0, help="Train on a random sample of N rows")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-cache', action='store_true', help="Do not reuse encoded CV folds from disk")
+    parser.add_argument('--promote', action='store_true', help=f"Also install the artifact as {MODEL_PATH}")
+    args = parser.parse_args()
+
+    artifact_path, metrics = train(
+        args.csv_path, args.versions_dir, args.folds, args.search_iter, args.search_estimators,
+        args.n_estimators, args.holdout, args.encoding, args.workers, args.sample, args.seed,
+        cache_dir=None if args.no_cache else CACHE_DIR
+    )
+    holdout = metrics['holdout']
+    print(f"Best parameters: {metrics['best_params']}")
+    print(f"Holdout RMSE {holdout['rmse']:,.0f}  MAE {holdout['mae']:,.0f}  R2 {holdout['r2']:.3f}")
+    print("Timings: " + ', '.join(f"{name} {seconds:.1f}s" for name, seconds in metrics['timings_s'].items()))
+    print(f"Wrote {artifact_path}")
+    if args.promote:
+        promote(artifact_path)
+        print(f"Promoted to {MODEL_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,61 @@
+import pandas as pd
 import plotly.express as px
 import streamlit as st
+from utils import cube as olap
+from utils.data_loader import dataset_version, load_figure_cache
+from utils.downsample import render_mode, time_buckets
+from utils.figure_cache import cached_chart, figure_key
+from utils.telemetry import timed
 
-def plot_import_trends(df):
-    fig = px.line(df, x='Import_Duration', y='CIF_Value_USD', 
-                 title='Import Value Trends Over Time')
-    st.plotly_chart(fig)
+# The dashboard charts read the pre-aggregated cube (utils.cube), so they cost
+# the same whether the rows live in memory or were streamed (utils.streaming).
+# They always show the whole cube, so the dataset version is their only key.
 
-def show_geo_distribution(df):
-    geo_df = df.groupby('Country_of_Origin', as_index=False)['CIF_Value_USD'].sum()
-    fig = px.choropleth(geo_df, locations='Country_of_Origin', 
-                       locationmode='country names', color='CIF_Value_USD',
-                       title='Import Value by Country')
-    st.plotly_chart(fig)
+def import_trends_figure(cube):
+    # One point per month instead of one per declaration
+    monthly = olap.rollup(cube, ['Year', 'Month']).reset_index()
+    monthly = pd.DataFrame({
+        'Import_Duration': monthly['Year'] + monthly['Month'] / 12,
+        'CIF_Value_USD': olap.total(monthly, 'CIF_Value_USD'),
+    })
+    trend = time_buckets(monthly, 'Import_Duration', 'CIF_Value_USD')
+    fig = px.line(trend, x='Import_Duration', y='CIF_Value_USD', 
+                 title='Import Value Trends Over Time',
+                 render_mode=render_mode(len(trend)))
+    return fig
 
-def display_kpi_cards(df):
-    total_imports = df['CIF_Value_USD'].sum()
-    avg_density = df['Value_Density'].mean()
+def geo_distribution_figure(cube):
+    countries = olap.rollup(cube, 'Country_of_Origin')
+    geo_df = pd.DataFrame({
+        'Country_of_Origin': countries.index.astype(object),
+        'CIF_Value_USD': olap.total(countries, 'CIF_Value_USD').to_numpy(),
+    })
+    return px.choropleth(geo_df, locations='Country_of_Origin', 
+                        locationmode='country names', color='CIF_Value_USD',
+                        title='Import Value by Country')
+
+def dashboard_views(cube, version):
+    """(cache key, builder) for each dashboard chart."""
+    return [
+        (figure_key('dashboard', 'trends', version=version), lambda: import_trends_figure(cube)),
+        (figure_key('dashboard', 'geo', version=version), lambda: geo_distribution_figure(cube)),
+    ]
+
+@timed('dashboard.plot_import_trends')
+def plot_import_trends(cube):
+    key, build = dashboard_views(cube, dataset_version())[0]
+    cached_chart(load_figure_cache(), key, build)
+
+@timed('dashboard.show_geo_distribution')
+def show_geo_distribution(cube):
+    key, build = dashboard_views(cube, dataset_version())[1]
+    cached_chart(load_figure_cache(), key, build)
+
+@timed('dashboard.display_kpi_cards')
+def display_kpi_cards(cube):
+    totals = cube[olap.measure_columns(cube)].sum()
+    total_imports = olap.total(totals, 'CIF_Value_USD')
+    avg_density = olap.mean(totals, 'Value_Density')
     
     st.markdown(f"""
     <div class="kpi-card">